@@ -37,17 +37,58 @@ class ThumbTypeSchema(Schema):
     )
 
 
+DEFAULT_PRICE_RULES = (
+    {
+        "max_age_months": 6,
+        "acceptable_conditions": ["Near Mint", "Very Fine"],
+        "min_price_delta": 2,
+        "use_cover_price": True,
+        "prices": {3.99: 400, 4.99: 500, 5.99: 600, 6.99: 600, 7.99: 800, 8.99: 800, 9.99: 800},
+    },
+    {
+        "max_age_months": None,
+        "acceptable_conditions": ["Near Mint", "Very Fine", "Fine", "Very Good"],
+        "min_price_delta": 3,
+        "use_cover_price": False,
+        "prices": {4: 400, 3.5: 350, 3: 300, 2.5: 250, 2: 200},
+    },
+)
+
+
+class PriceRuleSchema(Schema):
+    max_age_months = fields.Int(validate=validate.Range(min=0), allow_none=True, load_default=None)
+    acceptable_conditions = fields.List(fields.Str(), required=True)
+    min_price_delta = fields.Float(required=True)
+    use_cover_price = fields.Bool(required=True)
+    prices = fields.Dict(fields.Float(), fields.Int(validate=validate.Range(min=0)), required=True)
+
+
+class DbPoolSchema(Schema):
+    pool_size = fields.Int(validate=validate.Range(min=1), load_default=5)
+    max_overflow = fields.Int(validate=validate.Range(min=0), load_default=5)
+    pool_timeout_ms = fields.Int(validate=validate.Range(min=0), load_default=30000)
+    pool_recycle_s = fields.Int(validate=validate.Range(min=-1), load_default=1800)
+    pool_pre_ping = fields.Bool(load_default=True)
+    statement_timeout_ms = fields.Int(validate=validate.Range(min=0), load_default=0)
+
+
 class SecretConfigSchema(Schema):
     class Meta:
         unknown = EXCLUDE
 
     db_url = fields.Str(required=True, data_key="DB_URL")
+    db_replica_urls = fields.Function(
+        deserialize=lambda value: [url.strip() for url in value.split(",") if url.strip()],
+        load_default=list,
+        data_key="DB_REPLICA_URLS",
+    )
     broker_url = fields.Str(required=True, data_key="BROKER_URL")
     result_backend_url = fields.Str(required=True, data_key="RESULT_BACKEND_URL")
     password_key = fields.Str(required=True, data_key="PASSWORD_KEY")
     vapid_public_key = fields.Str(required=True, data_key="VAPID_PUBLIC_KEY")
     vapid_private_key = fields.Str(required=True, data_key="VAPID_PRIVATE_KEY")
     vapid_sub = fields.Str(required=True, data_key="VAPID_SUB")
+    metrics_token = fields.Str(load_default=None, data_key="METRICS_TOKEN")
     google_application_credentials = fields.Function(
         serialize=serialize_path,
         deserialize=deserialize_path,
@@ -79,6 +120,10 @@ class ConfigSchema(Schema):
     assets_path = fields.Function(serialize=serialize_path, deserialize=deserialize_path, required=True)
     images_path = fields.Function(serialize=serialize_path, deserialize=deserialize_path, required=True)
     full_images_path = fields.Function(serialize=serialize_path, deserialize=deserialize_path, required=True)
+    exports_path = fields.Function(serialize=serialize_path, deserialize=deserialize_path, load_default=Path("exports"))
+    db_pools = fields.Dict(fields.Str(), fields.Nested(DbPoolSchema), load_default=dict)
+    db_replica_lag_ms = fields.Int(validate=validate.Range(min=0), load_default=5000)
+    images_cache_max_age = fields.Int(validate=validate.Range(min=0), load_default=31536000)
     thumbnails = fields.Dict(fields.Str(), fields.Nested(ThumbTypeSchema), required=True)
     default_timezone = fields.Str(required=True)
     email_sender = fields.Str(required=True)
@@ -105,6 +150,38 @@ class ConfigSchema(Schema):
     shop_payment_gateway_id = fields.Int(required=True)
     shop_order_status_permalink = fields.Str(required=True)
     tasks_queue_name = fields.Str(required=True)
+    shop_api_workers = fields.Int(validate=validate.Range(min=1), load_default=4)
+    shop_api_requests_per_minute = fields.Int(validate=validate.Range(min=1), load_default=90)
+    shop_api_burst = fields.Int(validate=validate.Range(min=1), load_default=10)
+    shop_api_retries = fields.Int(validate=validate.Range(min=0), load_default=3)
+    shop_idempotency_ttl_hours = fields.Int(validate=validate.Range(min=1), load_default=24 * 7)
+    invoice_check_interval_s = fields.Int(validate=validate.Range(min=1), load_default=30)
+    invoice_check_max_interval_s = fields.Int(validate=validate.Range(min=1), load_default=6 * 60 * 60)
+    invoice_check_batch_size = fields.Int(validate=validate.Range(min=1), load_default=100)
+    export_spool_max_bytes = fields.Int(validate=validate.Range(min=0), load_default=8 * 1024 * 1024)
+    export_retention_hours = fields.Int(validate=validate.Range(min=1), load_default=24)
+    scan_workers = fields.Int(validate=validate.Range(min=1), allow_none=True, load_default=None)
+    barcode_cache_ttl_hours = fields.Int(validate=validate.Range(min=1), load_default=24 * 30)
+    parse_workers = fields.Int(validate=validate.Range(min=1), load_default=8)
+    supply_commit_batch_size = fields.Int(validate=validate.Range(min=1), load_default=10)
+    scrape_host_concurrency = fields.Int(validate=validate.Range(min=1), load_default=2)
+    scrape_host_interval_ms = fields.Int(validate=validate.Range(min=0), load_default=500)
+    scrape_connect_timeout_ms = fields.Int(validate=validate.Range(min=1), load_default=5000)
+    scrape_read_timeout_ms = fields.Int(validate=validate.Range(min=1), load_default=15000)
+    scrape_retries = fields.Int(validate=validate.Range(min=0), load_default=2)
+    scrape_workers = fields.Int(validate=validate.Range(min=1), load_default=8)
+    scrape_failure_threshold = fields.Int(validate=validate.Range(min=1), load_default=5)
+    scrape_failure_window_ms = fields.Int(validate=validate.Range(min=1), load_default=60000)
+    scrape_circuit_cooldown_ms = fields.Int(validate=validate.Range(min=1), load_default=60000)
+    item_counters_cache_ttl_ms = fields.Int(validate=validate.Range(min=0), load_default=10000)
+    file_removal_workers = fields.Int(validate=validate.Range(min=1), load_default=4)
+    upc_lookup_ttl_hours = fields.Int(validate=validate.Range(min=0), load_default=24 * 30)
+    upc_lookup_negative_ttl_hours = fields.Int(validate=validate.Range(min=0), load_default=24)
+    price_rules = fields.List(
+        fields.Nested(PriceRuleSchema),
+        validate=validate.Length(min=1),
+        load_default=lambda: [dict(rule) for rule in DEFAULT_PRICE_RULES],
+    )
 
 
 def _create_dirs(dirs) -> None:
@@ -116,6 +193,8 @@ def _create_dirs(dirs) -> None:
 @dataclass
 class Config:
     db_url: str
+    db_replica_urls: list[str]
+    db_replica_lag_ms: int
     broker_url: str
     result_backend_url: str
     result_ttl_ms: int
@@ -125,6 +204,9 @@ class Config:
     assets_path: Path
     images_path: Path
     full_images_path: Path
+    exports_path: Path
+    db_pools: dict[str, dict[str, ...]]
+    images_cache_max_age: int
     thumbnails: dict[str, ...]
     default_timezone: str
     email_sender: str
@@ -137,10 +219,29 @@ class Config:
     separators_start_price_position: tuple[int, int]
     separators_min_step_position: tuple[int, int]
     tasks_queue_name: str
+    scan_workers: int | None
+    barcode_cache_ttl_hours: int
+    parse_workers: int
+    supply_commit_batch_size: int
+    scrape_host_concurrency: int
+    scrape_host_interval_ms: int
+    scrape_connect_timeout_ms: int
+    scrape_read_timeout_ms: int
+    scrape_retries: int
+    scrape_workers: int
+    scrape_failure_threshold: int
+    scrape_failure_window_ms: int
+    scrape_circuit_cooldown_ms: int
+    item_counters_cache_ttl_ms: int
+    file_removal_workers: int
+    upc_lookup_ttl_hours: int
+    upc_lookup_negative_ttl_hours: int
+    price_rules: list[dict[str, ...]]
     password_key: bytes
     vapid_public_key: str
     vapid_private_key: str
     vapid_sub: str
+    metrics_token: str | None
     google_application_credentials: Path
     shop_id: str
     shop_api_key: str
@@ -149,6 +250,16 @@ class Config:
     shop_delivery_variant_id: int
     shop_payment_gateway_id: int
     shop_order_status_permalink: str
+    shop_api_workers: int
+    shop_api_requests_per_minute: int
+    shop_api_burst: int
+    shop_api_retries: int
+    shop_idempotency_ttl_hours: int
+    invoice_check_interval_s: int
+    invoice_check_max_interval_s: int
+    invoice_check_batch_size: int
+    export_spool_max_bytes: int
+    export_retention_hours: int
     auth0_admin_client_id: str
     auth0_admin_client_secret: str
     auth0_management_client_id: str
@@ -186,6 +297,7 @@ class Config:
             config["assets_path"],
             config["images_path"],
             config["full_images_path"],
+            config["exports_path"],
             config["email_templates_path"],
             config["separators_path"],
             config["separators_generated_path"],
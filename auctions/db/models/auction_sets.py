@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
+from sqlalchemy import text
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
@@ -13,11 +15,15 @@ if TYPE_CHECKING:
 
 class AuctionSet(Model):
     __tablename__ = "auction_sets"
+    __table_args__ = (
+        Index("ix_auction_sets_date_due_is_published", "date_due", "is_published"),
+        Index("ix_auction_sets_date_due_active", "date_due", postgresql_where=text("ended_at IS NULL")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     date_due: Mapped[datetime]
     anti_sniper: Mapped[int]
-    ended_at: Mapped[datetime | None]
+    ended_at: Mapped[datetime | None] = mapped_column(index=True)
     is_published: Mapped[bool] = mapped_column(default=False)
 
     auctions: Mapped[list["Auction"]] = relationship(
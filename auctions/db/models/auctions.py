@@ -4,6 +4,7 @@ from typing import Optional
 from typing import TYPE_CHECKING
 
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
@@ -19,11 +20,14 @@ if TYPE_CHECKING:
 
 class Auction(Model):
     __tablename__ = "auctions"
+    __table_args__ = (
+        Index("ix_auctions_set_id_ended_at", "set_id", "ended_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     set_id: Mapped[int] = mapped_column(ForeignKey("auction_sets.id", ondelete="CASCADE"))
     set: Mapped["AuctionSet"] = relationship("AuctionSet", foreign_keys="Auction.set_id", back_populates="auctions")
-    item_id: Mapped[int] = mapped_column(ForeignKey("items.id", ondelete="RESTRICT"))
+    item_id: Mapped[int] = mapped_column(ForeignKey("items.id", ondelete="RESTRICT"), index=True)
     item: Mapped["Item"] = relationship("Item", foreign_keys="Auction.item_id")
     date_due: Mapped[datetime]
     ended_at: Mapped[datetime | None]
@@ -3,6 +3,8 @@ from typing import TYPE_CHECKING
 from typing import Optional
 
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy import text
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
@@ -17,16 +19,20 @@ if TYPE_CHECKING:
 
 class Bid(Model):
     __tablename__ = "bids"
+    __table_args__ = (
+        Index("ix_bids_auction_id_created_at", "auction_id", "created_at"),
+        Index("ix_bids_auction_id_last", "auction_id", postgresql_where=text("next_bid_id IS NULL")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="RESTRICT"))
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="RESTRICT"), index=True)
     user: Mapped["User"] = relationship("User", foreign_keys="Bid.user_id", back_populates="bids")
     auction_id: Mapped[int] = mapped_column(ForeignKey("auctions.id", ondelete="CASCADE"))
     auction: Mapped["Auction"] = relationship("Auction", foreign_keys="Bid.auction_id", back_populates="bids")
     value: Mapped[int]
     is_sniped: Mapped[bool] = mapped_column(default=False)
     is_buyout: Mapped[bool] = mapped_column(default=False)
-    next_bid_id: Mapped[int | None] = mapped_column(ForeignKey("bids.id"))
+    next_bid_id: Mapped[int | None] = mapped_column(ForeignKey("bids.id"), index=True)
     next_bid: Mapped[Optional["Bid"]] = relationship(
         "Bid",
         uselist=False,
@@ -55,3 +55,20 @@ class CreateBidFailReason(Enum):
     INVALID_BUYOUT = "invalidBuyout"
     INVALID_BEATING = "invalidBeating"
     AUCTION_NOT_ACTIVE = "auctionNotActive"
+
+
+class ExportType(str, Enum):
+    EMPTY = "empty"
+    WINNERS = "winners"
+    BIDS = "bids"
+
+
+class ExportFormat(str, Enum):
+    XLSX = "xlsx"
+    CSV = "csv"
+
+
+class ExportJobStatus(Enum):
+    PENDING = "pending"
+    SUCCESS = "success"
+    FAILED = "failed"
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped
+from sqlalchemy.sql import func
+
+from auctions.db.models.base import Model
+from auctions.db.models.enum import ExportFormat
+from auctions.db.models.enum import ExportJobStatus
+from auctions.db.models.enum import ExportType
+
+if TYPE_CHECKING:
+    from auctions.db.models.auction_sets import AuctionSet
+
+
+class ExportJob(Model):
+    __tablename__ = "export_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    set_id: Mapped[int | None] = mapped_column(ForeignKey("auction_sets.id", ondelete="SET NULL"), index=True)
+    set: Mapped[Optional["AuctionSet"]] = relationship("AuctionSet", foreign_keys="ExportJob.set_id")
+    type: Mapped[ExportType]
+    format: Mapped[ExportFormat]
+    status: Mapped[ExportJobStatus] = mapped_column(default=ExportJobStatus.PENDING)
+    file_path: Mapped[str | None]
+    error: Mapped[str | None]
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
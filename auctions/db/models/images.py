@@ -21,3 +21,4 @@ class Image(Model):
     item: Mapped[Optional["Item"]] = relationship("Item", foreign_keys="Image.item_id", back_populates="images")
     urls: Mapped[dict[str, str]] = mapped_column(server_default="{}")
     is_main: Mapped[bool] = mapped_column(default=False)
+    content_hash: Mapped[str | None] = mapped_column(index=True)
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import Mapped
+
+from auctions.db.models.base import Model
+
+
+class Invoice(Model):
+    __tablename__ = "invoices"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    link: Mapped[str | None]
+    check_attempts: Mapped[int] = mapped_column(default=0)
+    next_check_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    last_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -3,6 +3,7 @@ from typing import Optional
 
 from sqlalchemy import Enum
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
@@ -22,6 +23,9 @@ if TYPE_CHECKING:
 
 class Item(Model):
     __tablename__ = "items"
+    __table_args__ = (
+        Index("ix_items_type_id_price_category_id", "type_id", "price_category_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(default="")
@@ -38,7 +42,7 @@ class Item(Model):
         foreign_keys="Item.price_category_id",
     )
 
-    session_id: Mapped[int | None] = mapped_column(ForeignKey("supply_sessions.id"), nullable=True)
+    session_id: Mapped[int | None] = mapped_column(ForeignKey("supply_sessions.id"), nullable=True, index=True)
     session: Mapped[Optional["SupplySession"]] = relationship(
         "SupplySession",
         foreign_keys="Item.session_id",
@@ -15,7 +15,7 @@ class PushSubscription(Model):
     __tablename__ = "push_subscriptions"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     user: Mapped["User"] = relationship(
         "User",
         foreign_keys="PushSubscription.user_id",
@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -18,5 +20,6 @@ class SupplySession(Model):
     id: Mapped[int] = mapped_column(primary_key=True)
     item_type_id: Mapped[int] = mapped_column(ForeignKey("item_types.id", ondelete="RESTRICT"))
     item_type: Mapped["ItemType"] = relationship("ItemType", foreign_keys="SupplySession.item_type_id")
+    processing_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     items: Mapped[list["Item"]] = relationship("Item", back_populates="session")
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import Mapped
+
+from auctions.db.models.base import Model
+
+
+class UpcLookup(Model):
+    __tablename__ = "upc_lookups"
+
+    upc: Mapped[str] = mapped_column(primary_key=True)
+    data: Mapped[dict[str, ...]] = mapped_column(server_default="{}")
+    is_found: Mapped[bool] = mapped_column(default=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
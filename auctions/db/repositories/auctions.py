@@ -1,7 +1,11 @@
+from typing import Iterator
 from typing import Self
 
 import loguru
+from sqlalchemy import delete
+from sqlalchemy import exists
 from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import aliased
 
 from auctions.db.models.auction_sets import AuctionSet
@@ -81,6 +85,43 @@ class AuctionsRepository(Repository[Auction]):
     def delete(self, instances: list[Auction]) -> None:
         super().delete(instances)
 
+    def stream_empty_auction_rows(self, set_id: int) -> Iterator[Row]:
+        return self._stream_rows(
+            select(Auction.id, Item.name, Item.upca, Item.upc5)
+            .join(Item, Auction.item_id == Item.id)
+            .where((Auction.set_id == set_id) & ~exists().where(Bid.auction_id == Auction.id))
+            .order_by(Auction.id)
+        )
+
+    def stream_winner_rows(self, set_id: int) -> Iterator[Row]:
+        return self._stream_rows(
+            select(
+                Auction.id,
+                Item.name,
+                Item.upca,
+                Item.upc5,
+                User.full_name,
+                User.email,
+                User.phone,
+                Bid.value,
+                Bid.is_buyout,
+                Auction.ended_at,
+                Auction.invoice_link,
+            )
+            .join(Item, Auction.item_id == Item.id)
+            .join(Bid, (Bid.auction_id == Auction.id) & Bid.next_bid_id.is_(None))
+            .join(User, Bid.user_id == User.id)
+            .where(Auction.set_id == set_id)
+            .order_by(User.email, Auction.id)
+        )
+
+    def delete_by_invoice_ids(self, invoice_ids: list[int]) -> list[int]:
+        if not invoice_ids:
+            return []
+
+        delete_statement = delete(Auction).where(Auction.invoice_id.in_(invoice_ids)).returning(Auction.item_id)
+        return list(self.session.execute(delete_statement).scalars().all())
+
     def with_user(self, user: User) -> Self:
         self.current_user = user
         return self
@@ -1,4 +1,5 @@
 from typing import Generic
+from typing import Iterator
 from typing import TypeVar
 
 from sqlalchemy import asc
@@ -6,24 +7,30 @@ from sqlalchemy import delete
 from sqlalchemy import desc
 from sqlalchemy import select
 from sqlalchemy import true
+from sqlalchemy import update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.sql.elements import BooleanClauseList
 from sqlalchemy.sql.elements import True_
 from sqlalchemy.sql.selectable import FromClause
+from sqlalchemy.sql.selectable import Select
 
 from auctions.config import Config
 from auctions.db.models.auction_sets import AuctionSet
 from auctions.db.models.auctions import Auction
 from auctions.db.models.bids import Bid
 from auctions.db.models.enum import SortOrder
+from auctions.db.models.exports import ExportJob
 from auctions.db.models.images import Image
+from auctions.db.models.invoices import Invoice
 from auctions.db.models.item_types import ItemType
 from auctions.db.models.items import Item
 from auctions.db.models.price_categories import PriceCategory
 from auctions.db.models.push import PushSubscription
 from auctions.db.models.sessions import SupplySession
 from auctions.db.models.templates import Template
+from auctions.db.models.upc_lookups import UpcLookup
 from auctions.db.models.users import User
 from auctions.dependencies import Provide
 from auctions.exceptions import ObjectDoesNotExist
@@ -33,19 +40,23 @@ Model = TypeVar(
     AuctionSet,
     Auction,
     Bid,
+    ExportJob,
     Image,
+    Invoice,
     ItemType,
     Item,
     PriceCategory,
     PushSubscription,
     SupplySession,
     Template,
+    UpcLookup,
     User,
 )
 
 
 class Repository(Generic[Model]):
     default_page_size: int = 50
+    stream_batch_size: int = 1000
     joined_fields: tuple[InstrumentedAttribute, ...] = ()
 
     def __init__(self, session: Session = Provide(), config: Config = Provide()) -> None:
@@ -66,6 +77,9 @@ class Repository(Generic[Model]):
 
         return select_statement
 
+    def _stream_rows(self, select_statement: Select) -> Iterator[Row]:
+        yield from self.session.execute(select_statement.execution_options(yield_per=self.stream_batch_size))
+
     def create(self, instance: Model | None = None, /, **kwargs) -> Model:
         if instance is None:
             instance = self.model(**kwargs)
@@ -74,6 +88,15 @@ class Repository(Generic[Model]):
         self.session.flush()
         return instance
 
+    def create_many(self, rows: list[dict[str, ...]]) -> list[Model]:
+        instances = [self.model(**kwargs) for kwargs in rows]
+
+        if instances:
+            self.session.add_all(instances)
+            self.session.flush()
+
+        return instances
+
     def get_many(
         self,
         filters: BooleanClauseList | True_ = true(),
@@ -149,13 +172,27 @@ class Repository(Generic[Model]):
     def refresh(self, instance: Model) -> None:
         self.session.refresh(instance)
 
-    def update(self, instance: Model, **kwargs) -> None:
-        self.session.merge(instance)
+    def update(self, instance: Model, **kwargs) -> Model:
+        if instance not in self.session:
+            instance = self.session.merge(instance)
 
         for key, value in kwargs.items():
             setattr(instance, key, value)
 
         self.session.flush()
+        return instance
+
+    def update_many(self, ids: list[int] | list[str], **values) -> None:
+        if not ids:
+            return
+
+        self.session.execute(update(self.model).where(self.pk.in_(ids)).values(**values))
 
     def delete(self, instances: list[Model]) -> None:
         self.session.execute(delete(self.model).where(self.pk.in_([instance.id for instance in instances])))
+
+    def delete_many(self, ids: list[int] | list[str]) -> None:
+        if not ids:
+            return
+
+        self.session.execute(delete(self.model).where(self.pk.in_(ids)))
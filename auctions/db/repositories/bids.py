@@ -1,4 +1,12 @@
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+
+from auctions.db.models.auctions import Auction
 from auctions.db.models.bids import Bid
+from auctions.db.models.items import Item
+from auctions.db.models.users import User
 from auctions.db.repositories.base import Repository
 
 
@@ -12,3 +20,23 @@ class BidsRepository(Repository[Bid]):
     @property
     def model(self) -> type[Bid]:
         return Bid
+
+    def stream_set_bid_rows(self, set_id: int) -> Iterator[Row]:
+        return self._stream_rows(
+            select(
+                Bid.id,
+                Bid.auction_id,
+                Item.name,
+                User.full_name,
+                User.email,
+                Bid.value,
+                Bid.is_sniped,
+                Bid.is_buyout,
+                Bid.created_at,
+            )
+            .join(Auction, Bid.auction_id == Auction.id)
+            .join(Item, Auction.item_id == Item.id)
+            .join(User, Bid.user_id == User.id)
+            .where(Auction.set_id == set_id)
+            .order_by(Bid.auction_id, Bid.created_at)
+        )
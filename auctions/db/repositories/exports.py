@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from auctions.db.models.exports import ExportJob
+from auctions.db.repositories.base import Repository
+
+
+class ExportJobsRepository(Repository[ExportJob]):
+    joined_fields = ()
+
+    @property
+    def model(self) -> type[ExportJob]:
+        return ExportJob
+
+    def get_created_before(self, created_before: datetime) -> list[ExportJob]:
+        return self.get_many(ExportJob.created_at < created_before, with_pagination=False, with_joined_fields=False)
@@ -1,23 +1,98 @@
-import os
+from functools import partial
+
+from sqlalchemy import case
+from sqlalchemy import delete
+from sqlalchemy import exists
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from auctions.db.models.images import Image
+from auctions.db.models.items import Item
 from auctions.db.repositories.base import Repository
+from auctions.utils.files import FileRemover
+
+StoredFiles = list[tuple[str | None, list[str]]]
 
 
 class ImagesRepository(Repository[Image]):
     joined_fields = ()
+    content_lock_namespace = 0x494D47
 
     @property
     def model(self) -> type[Image]:
         return Image
 
+    def get_referenced_hashes(self, content_hashes: set[str]) -> set[str]:
+        if not content_hashes:
+            return set()
+
+        select_statement = select(Image.content_hash).where(Image.content_hash.in_(content_hashes)).distinct()
+        return set(self.session.execute(select_statement).scalars().all())
+
+    def lock_content_hashes(self, content_hashes: set[str]) -> None:
+        for content_hash in sorted(content_hashes):
+            self._lock_content_hash(self.session, content_hash)
+
+    @classmethod
+    def _lock_content_hash(cls, session: Session, content_hash: str) -> None:
+        session.execute(select(func.pg_advisory_xact_lock(cls.content_lock_namespace, func.hashtext(content_hash))))
+
+    @classmethod
+    def is_content_referenced(cls, session: Session, content_hash: str) -> bool:
+        cls._lock_content_hash(session, content_hash)
+        return session.execute(select(exists().where(Image.content_hash == content_hash))).scalar()
+
+    def attach_to_items(self, items: list[Item], images: list[Image]) -> None:
+        item_ids = {image.id: item.id for item, image in zip(items, images)}
+
+        if not item_ids:
+            return
+
+        self.session.execute(
+            update(Image).where(Image.id.in_(item_ids)).values(item_id=case(item_ids, value=Image.id)),
+            execution_options={"synchronize_session": False},
+        )
+
+        for item, image in zip(items, images):
+            set_committed_value(image, "item_id", item.id)
+            set_committed_value(image, "item", item)
+            set_committed_value(item, "images", [image])
+
     def delete(self, instances: Image | list[Image]) -> None:
         if not isinstance(instances, list):
             instances = [instances]
 
-        for instance in instances:
-            for path in instance.urls.values():
-                if path and os.path.exists(path):
-                    os.unlink(path)
+        stored_files = [(instance.content_hash, list(instance.urls.values())) for instance in instances]
 
         super().delete(instances)
+        self._remove_unreferenced_files(stored_files)
+
+    def delete_for_session(self, session_id: int) -> None:
+        item_ids = select(Item.id).where(Item.session_id == session_id)
+
+        select_statement = select(Image.content_hash, Image.urls).where(Image.item_id.in_(item_ids))
+        stored_files = [
+            (content_hash, list(urls.values()))
+            for content_hash, urls in self.session.execute(select_statement).tuples().all()
+        ]
+
+        self.session.execute(delete(Image).where(Image.item_id.in_(item_ids)))
+        self._remove_unreferenced_files(stored_files)
+
+    def _remove_unreferenced_files(self, stored_files: StoredFiles) -> None:
+        referenced_hashes = self.get_referenced_hashes(
+            {content_hash for content_hash, _ in stored_files if content_hash is not None}
+        )
+
+        for content_hash, paths in stored_files:
+            if content_hash in referenced_hashes:
+                continue
+
+            FileRemover.schedule(
+                self.session,
+                [path for path in paths if path],
+                None if content_hash is None else partial(self.is_content_referenced, content_hash=content_hash),
+            )
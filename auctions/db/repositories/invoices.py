@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+
+from auctions.db.models.invoices import Invoice
+from auctions.db.repositories.base import Repository
+
+
+class InvoicesRepository(Repository[Invoice]):
+    joined_fields = ()
+
+    @property
+    def model(self) -> type[Invoice]:
+        return Invoice
+
+    def track(self, invoice_id: int, link: str, next_check_at: datetime, checked_at: datetime) -> None:
+        insert_statement = insert(Invoice).values(
+            id=invoice_id,
+            link=link,
+            check_attempts=0,
+            next_check_at=next_check_at,
+            last_checked_at=checked_at,
+        )
+        self.session.execute(insert_statement.on_conflict_do_nothing(index_elements=[Invoice.id]))
+
+    def get_tracked_ids(self, ids: list[int]) -> set[int]:
+        if not ids:
+            return set()
+
+        return set(self.session.execute(select(Invoice.id).where(Invoice.id.in_(ids))).scalars().all())
+
+    def get_due(self, now: datetime, limit: int) -> list[Invoice]:
+        select_statement = (
+            select(Invoice)
+            .where(Invoice.next_check_at <= now)
+            .order_by(Invoice.next_check_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(self.session.execute(select_statement).scalars().all())
+
+    def reschedule(self, ids: list[int], next_check_at: datetime, checked_at: datetime) -> None:
+        if not ids:
+            return
+
+        self.session.execute(
+            update(Invoice)
+            .where(Invoice.id.in_(ids))
+            .values(
+                check_attempts=Invoice.check_attempts + 1,
+                next_check_at=next_check_at,
+                last_checked_at=checked_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -1,8 +1,18 @@
+from sqlalchemy import Integer
+from sqlalchemy import cast
+from sqlalchemy import column
+from sqlalchemy import delete
+from sqlalchemy import exists
 from sqlalchemy import func
 from sqlalchemy import select
+from sqlalchemy import tuple_
+from sqlalchemy import update
+from sqlalchemy import values
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.selectable import FromClause
 
 from auctions.db.models.auctions import Auction
+from auctions.db.models.enum import SupplyItemParseStatus
 from auctions.db.models.items import Item
 from auctions.db.repositories.base import Repository
 
@@ -30,45 +40,123 @@ class ItemsRepository(Repository[Item]):
             .join(Item.images)
         )
 
-    def get_random_set(self, amounts: dict[int, dict[int, int]]) -> list[Item]:
-        items = []
+    @staticmethod
+    def _is_available() -> ColumnElement[bool]:
+        return ~exists().where(Auction.item_id == Item.id)
 
-        non_auction_items = select(Item.id).where(
-            Item.id.not_in(select(Auction.item_id).where(Auction.item_id.is_not(None)))
-        )
+    def get_random_set(self, amounts: dict[int, dict[int, int]]) -> list[Item]:
+        requested = [
+            (item_type_id, price_category_id, item_amount)
+            for item_type_id in amounts
+            for price_category_id, item_amount in amounts[item_type_id].items()
+            if item_amount > 0
+        ]
 
-        for item_type_id in amounts:
-            for price_category_id in amounts[item_type_id]:
-                item_amount = amounts[item_type_id][price_category_id]
+        if not requested:
+            return []
 
-                if item_amount == 0:
-                    continue
+        requested_amounts = values(
+            column("type_id", Integer),
+            column("price_category_id", Integer),
+            column("amount", Integer),
+            name="requested_amounts",
+        ).data(requested)
 
-                filters = (
-                    Item.id.in_(non_auction_items)
-                    & (Item.type_id == item_type_id)
-                    & (Item.price_category_id == price_category_id)
+        ranked_items = (
+            select(
+                Item.id,
+                Item.type_id,
+                Item.price_category_id,
+                func.row_number().over(
+                    partition_by=(Item.type_id, Item.price_category_id),
+                    order_by=func.random(),
+                ).label("rank"),
+            )
+            .where(
+                self._is_available()
+                & tuple_(Item.type_id, Item.price_category_id).in_(
+                    [(item_type_id, price_category_id) for item_type_id, price_category_id, _ in requested]
                 )
+            )
+            .subquery()
+        )
 
-                select_statement = select(Item).where(filters).order_by(func.random()).limit(item_amount)
-                select_statement = self._apply_joined_fields(select_statement)
-                items.extend(self.session.execute(select_statement).scalars().unique().all())
+        sampled_ids = (
+            select(ranked_items.c.id)
+            .join(
+                requested_amounts,
+                (ranked_items.c.type_id == requested_amounts.c.type_id)
+                & (ranked_items.c.price_category_id == requested_amounts.c.price_category_id),
+            )
+            .where(ranked_items.c.rank <= requested_amounts.c.amount)
+        )
 
-        return items
+        select_statement = (
+            select(Item)
+            .where(Item.id.in_(sampled_ids))
+            .order_by(Item.type_id, Item.price_category_id)
+        )
+        select_statement = self._apply_joined_fields(select_statement)
+        return self.session.execute(select_statement).scalars().unique().all()
 
     def get_random_one(self, item_type_id: int, price_category_id: int, exclude_ids: list[int]) -> Item | None:
-        non_auction_items = select(Item.id).where(Item.id.not_in(select(Auction.item_id).subquery())).subquery()
+        is_candidate = (
+            self._is_available()
+            & (Item.type_id == item_type_id)
+            & (Item.price_category_id == price_category_id)
+            & (Item.id.not_in(exclude_ids))
+        )
 
-        select_statement = (
-            select(Item)
-            .where(
-                (Item.id.in_(non_auction_items))
-                & (Item.type_id == item_type_id)
-                & (Item.price_category_id == price_category_id)
-                & (Item.id.not_in(exclude_ids))
-            )
-            .order_by(func.random())
+        # A random offset into the candidate ids replaces ORDER BY random(), which had to sort every
+        # candidate row, and keeps LIMIT away from the joined images.
+        candidates_count = select(func.count()).select_from(Item).where(is_candidate).scalar_subquery()
+        picked_id = (
+            select(Item.id)
+            .where(is_candidate)
+            .order_by(Item.id)
+            .offset(cast(func.floor(func.random() * candidates_count), Integer))
             .limit(1)
+            .scalar_subquery()
         )
+
+        select_statement = select(Item).where(Item.id == picked_id)
         select_statement = self._apply_joined_fields(select_statement)
         return self.session.execute(select_statement).scalars().unique().first()
+
+    def count_by_parse_status(self, session_id: int) -> dict[SupplyItemParseStatus, int]:
+        select_statement = (
+            select(Item.parse_status, func.count())
+            .where(Item.session_id == session_id)
+            .group_by(Item.parse_status)
+        )
+        return dict(self.session.execute(select_statement).tuples().all())
+
+    def count_not_in_parse_status(self, session_id: int, parse_status: SupplyItemParseStatus) -> int:
+        select_statement = (
+            select(func.count())
+            .select_from(Item)
+            .where((Item.session_id == session_id) & (Item.parse_status != parse_status))
+        )
+        return self.session.execute(select_statement).scalar_one()
+
+    def detach_from_session(self, session_id: int) -> list[int]:
+        update_statement = (
+            update(Item)
+            .where(Item.session_id == session_id)
+            .values(session_id=None)
+            .returning(Item.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(self.session.execute(update_statement).scalars().all())
+
+    def delete_for_session(self, session_id: int) -> None:
+        self.session.execute(delete(Item).where(Item.session_id == session_id))
+
+    def count_available_by_type_and_price(self) -> list[tuple[int, int, int]]:
+        select_statement = (
+            select(Item.type_id, Item.price_category_id, func.count())
+            .where(self._is_available() & Item.price_category_id.is_not(None))
+            .group_by(Item.type_id, Item.price_category_id)
+            .order_by(Item.type_id, Item.price_category_id)
+        )
+        return list(self.session.execute(select_statement).tuples().all())
@@ -4,7 +4,33 @@ from auctions.db.repositories.base import Repository
 
 class PriceCategoriesRepository(Repository[PriceCategory]):
     joined_fields = ()
+    changed_key = "price_categories_changed"
 
     @property
     def model(self) -> type[PriceCategory]:
         return PriceCategory
+
+    def mark_changed(self) -> None:
+        self.session.info[self.changed_key] = True
+
+    def create(self, instance: PriceCategory | None = None, /, **kwargs) -> PriceCategory:
+        instance = super().create(instance, **kwargs)
+        self.mark_changed()
+        return instance
+
+    def update(self, instance: PriceCategory, **kwargs) -> PriceCategory:
+        instance = super().update(instance, **kwargs)
+        self.mark_changed()
+        return instance
+
+    def update_many(self, ids: list[int], **values) -> None:
+        super().update_many(ids, **values)
+        self.mark_changed()
+
+    def delete(self, instances: list[PriceCategory]) -> None:
+        super().delete(instances)
+        self.mark_changed()
+
+    def delete_many(self, ids: list[int]) -> None:
+        super().delete_many(ids)
+        self.mark_changed()
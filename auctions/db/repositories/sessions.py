@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
 from auctions.db.models.items import Item
 from auctions.db.models.sessions import SupplySession
 from auctions.db.repositories.base import Repository
@@ -16,5 +20,24 @@ class SupplySessionsRepository(Repository[SupplySession]):
     def model(self) -> type[SupplySession]:
         return SupplySession
 
-    def get_current_session(self) -> SupplySession | None:
-        return self.get_one()
+    def get_current_session(self, with_joined_fields: bool = True) -> SupplySession | None:
+        return self.get_one(with_joined_fields=with_joined_fields)
+
+    def try_start_processing(self, session_id: int, now: datetime, stale_before: datetime) -> bool:
+        update_statement = (
+            update(SupplySession)
+            .where(
+                (SupplySession.id == session_id)
+                & (
+                    SupplySession.processing_started_at.is_(None)
+                    | (SupplySession.processing_started_at < stale_before)
+                )
+            )
+            .values(processing_started_at=now)
+            .returning(SupplySession.id)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(update_statement).scalar() is not None
+
+    def finish_processing(self, session_id: int) -> None:
+        self.update_many([session_id], processing_started_at=None)
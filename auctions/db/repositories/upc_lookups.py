@@ -0,0 +1,44 @@
+from datetime import datetime
+from datetime import timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from auctions.db.models.upc_lookups import UpcLookup
+from auctions.db.repositories.base import Repository
+
+
+class UpcLookupsRepository(Repository[UpcLookup]):
+    joined_fields = ()
+
+    @property
+    def model(self) -> type[UpcLookup]:
+        return UpcLookup
+
+    @property
+    def pk(self) -> InstrumentedAttribute:
+        return UpcLookup.upc
+
+    def get_fresh(self, upcs: list[str]) -> dict[str, UpcLookup]:
+        if not upcs:
+            return {}
+
+        select_statement = select(UpcLookup).where(
+            UpcLookup.upc.in_(upcs)
+            & (UpcLookup.expires_at > datetime.now(timezone.utc))
+        )
+        return {lookup.upc: lookup for lookup in self.session.execute(select_statement).scalars().all()}
+
+    def store(self, upc: str, data: dict[str, ...], is_found: bool, expires_at: datetime) -> None:
+        insert_statement = insert(UpcLookup).values(upc=upc, data=data, is_found=is_found, expires_at=expires_at)
+        self.session.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=[UpcLookup.upc],
+                set_={
+                    "data": insert_statement.excluded.data,
+                    "is_found": insert_statement.excluded.is_found,
+                    "expires_at": insert_statement.excluded.expires_at,
+                },
+            )
+        )
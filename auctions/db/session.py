@@ -1,12 +1,189 @@
+import random
+from threading import Lock
+from time import perf_counter
+
+import loguru
+from redis import Redis
+from redis import RedisError
 from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState
+from sqlalchemy.orm import Session
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from auctions.config import Config
+from auctions.config import DbPoolSchema
+
+
+class PoolMetrics:
+    def __init__(self, role: str) -> None:
+        self.role = role
+
+        self._lock = Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self, engine: Engine) -> dict[str, ...]:
+        pool = engine.pool
+
+        with self._lock:
+            return {
+                "role": self.role,
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checkouts": self.checkouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+def create_pool_class(metrics: PoolMetrics) -> type[QueuePool]:
+    class InstrumentedQueuePool(QueuePool):
+        def _do_get(self):
+            started_at = perf_counter()
+
+            try:
+                return super()._do_get()
+            finally:
+                metrics.record_wait(perf_counter() - started_at)
+
+    return InstrumentedQueuePool
+
+
+def get_pool_settings(config: Config, role: str) -> dict[str, ...]:
+    if role in config.db_pools:
+        return config.db_pools[role]
+
+    return DbPoolSchema().load({})
+
+
+def create_db_engine(config: Config, role: str, metrics: PoolMetrics, url: str | None = None) -> Engine:
+    settings = get_pool_settings(config, role)
+    connect_args = {}
+
+    if settings["statement_timeout_ms"]:
+        connect_args["options"] = f"-c statement_timeout={settings['statement_timeout_ms']}"
+
+    return create_engine(
+        url or config.db_url,
+        echo=config.debug and role == "app",
+        poolclass=create_pool_class(metrics),
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_timeout=settings["pool_timeout_ms"] / 1000,
+        pool_recycle=settings["pool_recycle_s"],
+        pool_pre_ping=settings["pool_pre_ping"],
+        connect_args=connect_args,
+    )
+
+
+class RoutingSession(Session):
+    read_only_key = "read_only"
+    replica_key = "replica_engine"
+
+    def __init__(self, replica_engines: list[Engine] | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.replica_engines = replica_engines or []
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+        if self.info.get(self.read_only_key) and self.replica_engines and not self._flushing:
+            if self.replica_key not in self.info:
+                self.info[self.replica_key] = random.choice(self.replica_engines)
+
+            return self.info[self.replica_key]
+
+        return super().get_bind(mapper, clause, **kwargs)
 
 
 class SessionManager:
-    def __init__(self, config: Config) -> None:
+    user_key = "user_id"
+    writes_key = "has_writes"
+    recent_write_key_prefix = "db:recent_write"
+
+    def __init__(self, config: Config, role: str = "app", redis: Redis | None = None) -> None:
         self.config = config
-        self.engine = create_engine(config.db_url, echo=config.debug)
-        self.session = scoped_session(sessionmaker(bind=self.engine))
+        self.role = role
+        self.redis = redis
+        self.pool_metrics = PoolMetrics(role)
+        self.engine = create_db_engine(config, role, self.pool_metrics)
+        self.replicas: list[tuple[PoolMetrics, Engine]] = []
+
+        for url in config.db_replica_urls:
+            replica_metrics = PoolMetrics(f"{role}_replica")
+            self.replicas.append((replica_metrics, create_db_engine(config, replica_metrics.role, replica_metrics, url)))
+
+        self.session_factory = sessionmaker(
+            bind=self.engine,
+            class_=RoutingSession,
+            replica_engines=[engine for _, engine in self.replicas],
+        )
+        self.session = scoped_session(self.session_factory)
+
+        if self.replicas:
+            event.listen(self.session_factory, "after_flush", self._on_flush)
+            event.listen(self.session_factory, "do_orm_execute", self._on_orm_execute)
+            event.listen(self.session_factory, "after_commit", self._on_commit)
+
+    def route_read_only(self, user_id: str | None) -> None:
+        if not self.replicas or self.has_recent_write(user_id):
+            return
+
+        self.session.info[RoutingSession.read_only_key] = True
+
+    def track_writes(self, user_id: str | None) -> None:
+        if self.replicas and user_id is not None:
+            self.session.info[self.user_key] = user_id
+
+    def has_recent_write(self, user_id: str | None) -> bool:
+        if user_id is None:
+            return False
+
+        if self.redis is None:
+            return True
+
+        try:
+            return bool(self.redis.exists(f"{self.recent_write_key_prefix}:{user_id}"))
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not check recent writes of {user_id}: {exception}")
+            return True
+
+    def _on_flush(self, session: Session, flush_context) -> None:
+        session.info[self.writes_key] = True
+
+    def _on_orm_execute(self, orm_execute_state: ORMExecuteState) -> None:
+        if not orm_execute_state.is_select:
+            orm_execute_state.session.info[self.writes_key] = True
+
+    def _on_commit(self, session: Session) -> None:
+        if not session.info.pop(self.writes_key, False) or self.user_key not in session.info:
+            return
+
+        if self.redis is None:
+            return
+
+        try:
+            self.redis.set(
+                f"{self.recent_write_key_prefix}:{session.info[self.user_key]}",
+                1,
+                px=self.config.db_replica_lag_ms,
+            )
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not record a recent write: {exception}")
+
+    def get_pool_status(self) -> list[dict[str, ...]]:
+        return [
+            self.pool_metrics.snapshot(self.engine),
+            *(metrics.snapshot(engine) for metrics, engine in self.replicas),
+        ]
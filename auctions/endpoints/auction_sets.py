@@ -1,18 +1,22 @@
-import base64
-
+from flask import Response
 from flask import request
+from flask import send_file
 from webargs import fields
 from webargs.flaskparser import parser
 
 from auctions.db.models.auction_sets import AuctionSet
+from auctions.db.models.enum import ExportFormat
+from auctions.db.models.enum import ExportType
 from auctions.dependencies import Provide
 from auctions.endpoints.crud import create_crud_blueprint
 from auctions.serializers.auction_sets import AuctionSetCreateSerializer
 from auctions.serializers.auction_sets import AuctionSetSerializer
+from auctions.serializers.exports import ExportJobSerializer
 from auctions.serializers.ok import OkSerializer
 from auctions.services.auctions_service import AuctionsService
 from auctions.services.export_service import ExportService
 from auctions.utils.endpoints import endpoint
+from auctions.utils.export import content_types
 from auctions.utils.response import JsonResponse
 
 blueprint = create_crud_blueprint(
@@ -24,6 +28,7 @@ blueprint = create_crud_blueprint(
     },
     operations={"list", "read"},
     protected={"list", "read"},
+    read_only={"list", "read"},
 )
 
 
@@ -62,11 +67,42 @@ def unpublish_auction_set(
     return JsonResponse(auction_set_serializer.dump(auction_set))
 
 
-@endpoint(blueprint.post("/<int:id_>/export/empty"))
-def export_empty_auctions(id_: int, export_service: ExportService = Provide()) -> JsonResponse:
-    export_result = export_service.export_empty_auctions(id_)
-    export_encoded = base64.b64encode(export_result)
-    return JsonResponse({"result": export_encoded.decode("utf-8")})
+@endpoint(blueprint.get("/<int:id_>/export/<any(empty, winners, bids):export_type>"), read_only=True)
+def export_auction_set(id_: int, export_type: str, export_service: ExportService = Provide()) -> Response:
+    args = parser.parse(
+        {
+            "format": fields.Enum(ExportFormat, by_value=True, load_default=ExportFormat.XLSX),
+        },
+        request,
+        location="query",
+    )
+    export_type = ExportType(export_type)
+    export_format = args["format"]
+
+    return send_file(
+        export_service.export(id_, export_type, export_format),
+        mimetype=content_types[export_format],
+        as_attachment=True,
+        download_name=export_service.get_filename(id_, export_type, export_format),
+    )
+
+
+@endpoint(blueprint.post("/<int:id_>/exports"))
+def create_export_job(
+    id_: int,
+    export_service: ExportService = Provide(),
+    export_job_serializer: ExportJobSerializer = Provide(),
+) -> JsonResponse:
+    args = parser.parse(
+        {
+            "type": fields.Enum(ExportType, by_value=True, required=True),
+            "format": fields.Enum(ExportFormat, by_value=True, load_default=ExportFormat.XLSX),
+        },
+        request,
+        location="query",
+    )
+    job = export_service.create_job(id_, args["type"], args["format"])
+    return JsonResponse(export_job_serializer.dump(job))
 
 
 @endpoint(blueprint.delete("/<int:id_>"))
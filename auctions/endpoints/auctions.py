@@ -16,7 +16,7 @@ from auctions.utils.response import JsonResponse
 blueprint = Blueprint("auctions", __name__, url_prefix="/auctions")
 
 
-@endpoint(blueprint.get("/my"), is_admin=False, inject_user=True)
+@endpoint(blueprint.get("/my"), is_admin=False, inject_user=True, read_only=True)
 def get_own_auctions(
     user: User,
     auctions_service: AuctionsService = Provide(),
@@ -36,7 +36,7 @@ def get_won_auctions(
     return JsonResponse(won_auction_pack_serializer.dump(packs, many=True))
 
 
-@endpoint(blueprint.get(""), is_admin=False, inject_user=True)
+@endpoint(blueprint.get(""), is_admin=False, inject_user=True, read_only=True)
 def list_active_auctions(
     user: User,
     auctions_service: AuctionsService = Provide(),
@@ -32,10 +32,12 @@ def create_crud_blueprint(
     update_args: dict[str, ...] | BaseSerializer = None,
     operations: set[str] | None = None,
     protected: set[str] | None = None,
+    read_only: set[str] | None = None,
     non_int_id: bool = False,
 ) -> Blueprint:
     operations = operations or {"list", "create", "read", "update", "delete"}
     protected = protected or {"list", "create", "read", "update", "delete"}
+    read_only = read_only or set()
 
     name_singular = to_snake_case(model.__name__)
     name_plural = model.__tablename__
@@ -137,7 +139,7 @@ def create_crud_blueprint(
 
         apply_decorators(
             bind_function_name(func, func_name),
-            endpoint(method(url), is_admin=operation in protected),
+            endpoint(method(url), is_admin=operation in protected, read_only=operation in read_only),
         )
 
     return blueprint
@@ -0,0 +1,39 @@
+from flask import Response
+from flask import send_file
+from flask.blueprints import Blueprint
+
+from auctions.db.repositories.exports import ExportJobsRepository
+from auctions.dependencies import Provide
+from auctions.serializers.exports import ExportJobSerializer
+from auctions.services.export_service import ExportService
+from auctions.utils.endpoints import endpoint
+from auctions.utils.export import content_types
+from auctions.utils.response import JsonResponse
+
+blueprint = Blueprint("exports", __name__, url_prefix="/exports")
+
+
+@endpoint(blueprint.get("/<int:id_>"))
+def get_export_job(
+    id_: int,
+    export_jobs_repository: ExportJobsRepository = Provide(),
+    export_job_serializer: ExportJobSerializer = Provide(),
+) -> JsonResponse:
+    job = export_jobs_repository.get_one_by_id(id_)
+    return JsonResponse(export_job_serializer.dump(job))
+
+
+@endpoint(blueprint.get("/<int:id_>/file"))
+def download_export(
+    id_: int,
+    export_jobs_repository: ExportJobsRepository = Provide(),
+    export_service: ExportService = Provide(),
+) -> Response:
+    job = export_jobs_repository.get_one_by_id(id_)
+
+    return send_file(
+        export_service.get_job_file_path(job),
+        mimetype=content_types[job.format],
+        as_attachment=True,
+        download_name=export_service.get_filename(job.set_id, job.type, job.format),
+    )
@@ -27,7 +27,7 @@ blueprint = create_crud_blueprint(
 )
 
 
-@endpoint(blueprint.get(""))
+@endpoint(blueprint.get(""), read_only=True)
 def list_items(
     items_service: ItemsService = Provide(),
     item_filter_request_serializer: ItemFilterRequestSerializer = Provide(),
@@ -38,7 +38,7 @@ def list_items(
     return JsonResponse(item_serializer.dump(result, many=True))
 
 
-@endpoint(blueprint.get("/counters"))
+@endpoint(blueprint.get("/counters"), read_only=True)
 def get_item_counters(
     items_service: ItemsService = Provide(),
     item_counters_serializer: ItemCountersSerializer = Provide(),
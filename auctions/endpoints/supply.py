@@ -13,6 +13,8 @@ from auctions.exceptions import SessionStartFailed
 from auctions.serializers.items import ItemJoinData
 from auctions.serializers.items import ItemSerializer
 from auctions.serializers.ok import OkSerializer
+from auctions.serializers.sessions import AppliedSupplySessionSerializer
+from auctions.serializers.sessions import SupplySessionProgressSerializer
 from auctions.serializers.sessions import SupplySessionSerializer
 from auctions.services.supply_service import SupplyService
 from auctions.utils.endpoints import endpoint
@@ -46,7 +48,7 @@ def start_session(
     )
 
     try:
-        supply_service.get_current_session()
+        supply_service.get_current_session(with_joined_fields=False)
         raise SessionStartFailed("Cannot start a session while there is already one in progress")
     except ObjectDoesNotExist:
         pass
@@ -70,6 +72,26 @@ def process_item(
     return JsonResponse(item_serializer.dump(item))
 
 
+@endpoint(blueprint.post("/current/process"))
+def process_session(
+    supply_service: SupplyService = Provide(),
+    supply_session_progress_serializer: SupplySessionProgressSerializer = Provide(),
+) -> JsonResponse:
+    session = supply_service.schedule_session_processing()
+    progress = supply_service.get_session_progress(session)
+    return JsonResponse(supply_session_progress_serializer.dump(progress))
+
+
+@endpoint(blueprint.get("/current/progress"))
+def get_session_progress(
+    supply_service: SupplyService = Provide(),
+    supply_session_progress_serializer: SupplySessionProgressSerializer = Provide(),
+) -> JsonResponse:
+    session = supply_service.get_current_session(with_joined_fields=False)
+    progress = supply_service.get_session_progress(session)
+    return JsonResponse(supply_session_progress_serializer.dump(progress))
+
+
 @endpoint(blueprint.post("/current/add"))
 def add_images(
     images_repository: ImagesRepository = Provide(),
@@ -108,10 +130,10 @@ def join_items(
 @endpoint(blueprint.post("/current/apply"))
 def apply_session(
     supply_service: SupplyService = Provide(),
-    item_serializer: ItemSerializer = Provide(),
+    applied_supply_session_serializer: AppliedSupplySessionSerializer = Provide(),
 ) -> JsonResponse:
-    items = supply_service.apply_session()
-    return JsonResponse(item_serializer.dump(items, many=True))
+    result = supply_service.apply_session()
+    return JsonResponse(applied_supply_session_serializer.dump(result))
 
 
 @endpoint(blueprint.post("/current/discard"))
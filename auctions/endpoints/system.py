@@ -0,0 +1,34 @@
+import hmac
+
+from flask import Response
+from flask import request
+from flask.blueprints import Blueprint
+
+from auctions.config import Config
+from auctions.db.session import SessionManager
+from auctions.dependencies import Provide
+from auctions.exceptions import NotAuthorizedError
+from auctions.serializers.system import PoolStatusSerializer
+from auctions.utils.endpoints import endpoint
+from auctions.utils.metrics import RequestMetrics
+from auctions.utils.response import JsonResponse
+
+blueprint = Blueprint("system", __name__, url_prefix="/system")
+
+
+@endpoint(blueprint.get("/db_pool"))
+def get_db_pool_status(
+    session_manager: SessionManager = Provide(),
+    pool_status_serializer: PoolStatusSerializer = Provide(),
+) -> JsonResponse:
+    return JsonResponse(pool_status_serializer.dump(session_manager.get_pool_status(), many=True))
+
+
+@endpoint(blueprint.get("/metrics"), protected=False)
+def get_metrics(request_metrics: RequestMetrics = Provide(), config: Config = Provide()) -> Response:
+    token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+
+    if not config.metrics_token or not hmac.compare_digest(token.encode(), config.metrics_token.encode()):
+        raise NotAuthorizedError
+
+    return Response(request_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
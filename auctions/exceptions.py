@@ -110,3 +110,7 @@ class CreateBidFailed(ConflictError):
         super().__init__(*args, **kwargs)
         self.message = self.default_message
         self.extra = {"reason": reason.value}
+
+
+class ExportNotReady(ConflictError):
+    default_message: str = "Export is not finished yet or has failed"
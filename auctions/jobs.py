@@ -7,3 +7,7 @@ def periodic_auction_set_check() -> None:
 
 def periodic_invoice_check() -> None:
     ScheduleService.check_invoices()
+
+
+def periodic_export_cleanup() -> None:
+    ScheduleService.remove_expired_exports()
@@ -2,6 +2,7 @@ from argon2 import PasswordHasher
 from dramatiq import set_broker
 from dramatiq.brokers.redis import RedisBroker
 from flask import jsonify
+from redis import Redis
 
 from auctions.config import Config
 from auctions.db.session import SessionManager
@@ -9,8 +10,14 @@ from auctions.dependencies import DependencyProvider
 from auctions.endpoints import connect_blueprints
 from auctions.utils.app import Flask
 from auctions.utils.cipher import AESCipher
+from auctions.utils.counters import ItemCountersCache
 from auctions.utils.error_handler import handle_exception
+from auctions.utils.files import FileRemover
+from auctions.utils.metrics import RequestMetrics
 from auctions.utils.oauth import create_oauth
+from auctions.utils.price_categories import PriceCategoryIndex
+from auctions.utils.scraping import HostGuard
+from auctions.utils.scraping import ScrapingClient
 from uvicorn_config import run_configured
 
 from flask_cors import CORS
@@ -18,7 +25,8 @@ from flask_cors import CORS
 
 def create_app(config: Config) -> Flask:
     app = Flask(__name__)
-    session_manager = SessionManager(config)
+    redis = Redis.from_url(config.broker_url)
+    session_manager = SessionManager(config, redis=redis)
     oauth = create_oauth(app, config)
     broker = RedisBroker(url=config.broker_url)
     set_broker(broker)
@@ -29,6 +37,12 @@ def create_app(config: Config) -> Flask:
     app.provider.add_global(PasswordHasher())
     app.provider.add_global(AESCipher(config.password_key))
     app.provider.add_global(oauth)
+    app.provider.add_global(redis)
+    app.provider.add_global(ScrapingClient(config, guard=HostGuard(redis, config)))
+    app.provider.add_global(PriceCategoryIndex(redis))
+    app.provider.add_global(FileRemover(config, session_manager.session_factory))
+    app.provider.add_global(ItemCountersCache(redis, config))
+    app.provider.add_global(RequestMetrics())
 
     @app.errorhandler(422)
     @app.errorhandler(405)
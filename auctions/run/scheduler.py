@@ -8,6 +8,7 @@ from dramatiq.brokers.redis import RedisBroker
 
 from auctions.config import Config
 from auctions.jobs import periodic_auction_set_check
+from auctions.jobs import periodic_export_cleanup
 from auctions.jobs import periodic_invoice_check
 
 
@@ -30,6 +31,13 @@ def create_scheduler(config: Config) -> BlockingScheduler:
         seconds=30,
         max_instances=1,
     )
+    scheduler.add_job(
+        periodic_export_cleanup,
+        "interval",
+        id="periodic_export_cleanup",
+        hours=1,
+        max_instances=1,
+    )
 
     return scheduler
 
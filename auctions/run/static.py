@@ -0,0 +1,65 @@
+from mimetypes import guess_type
+from pathlib import Path
+
+from flask import Flask
+from flask import Response
+from flask import send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+from auctions.config import Config
+from uvicorn_config import run_configured
+
+
+def resolve_image_path(images_root: Path, path: str) -> Path:
+    joined_path = safe_join(str(Path.cwd()), path)
+
+    if joined_path is None:
+        raise NotFound
+
+    full_path = Path(joined_path).resolve()
+
+    if not full_path.is_relative_to(images_root) or not full_path.is_file():
+        raise NotFound
+
+    return full_path
+
+
+def create_static_app(config: Config) -> Flask:
+    app = Flask(__name__)
+    images_root = config.images_path.resolve()
+
+    @app.get("/<path:path>")
+    def get_image(path: str) -> Response:
+        full_path = resolve_image_path(images_root, path)
+        mime_type, _ = guess_type(full_path.name)
+        mime_type = mime_type or "application/octet-stream"
+
+        response = send_file(
+            full_path,
+            mimetype=mime_type,
+            conditional=True,
+            max_age=config.images_cache_max_age,
+        )
+
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    return app
+
+
+def run_static(config: Config) -> None:
+    app = create_static_app(config)
+
+    try:
+        if config.debug:
+            app.run(debug=config.debug, host="0.0.0.0", port=5001)
+        else:
+            run_configured(app, port=5001)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+
+
+def main(config: Config) -> None:
+    run_static(config)
@@ -1,5 +1,9 @@
 from marshmallow import Schema
 
+from auctions.utils.metrics import measure
+
 
 class BaseSerializer(Schema):
-    ...
+    def dump(self, obj: ..., *, many: bool | None = None) -> ...:
+        with measure("serialize"):
+            return super().dump(obj, many=many)
@@ -0,0 +1,17 @@
+from marshmallow import fields
+
+from auctions.db.models.enum import ExportFormat
+from auctions.db.models.enum import ExportJobStatus
+from auctions.db.models.enum import ExportType
+from auctions.serializers.base import BaseSerializer
+
+
+class ExportJobSerializer(BaseSerializer):
+    id = fields.Int(dump_only=True)
+    set_id = fields.Int(allow_none=True, data_key="setId")
+    type = fields.Enum(ExportType, by_value=True)
+    format = fields.Enum(ExportFormat, by_value=True)
+    status = fields.Enum(ExportJobStatus, by_value=True)
+    error = fields.Str(allow_none=True)
+    created_at = fields.DateTime(data_key="createdAt")
+    finished_at = fields.DateTime(allow_none=True, data_key="finishedAt")
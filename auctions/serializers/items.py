@@ -13,6 +13,7 @@ class ItemParseDataSerializer(BaseSerializer):
     cover_price = fields.Float(required=False, allow_none=True, allow_blank=True, data_key="coverPrice")
     condition_prices = fields.Dict(required=False, allow_none=True, allow_blank=True, data_key="conditionPrices")
     related_links = fields.List(fields.Str(), required=False, default=[], data_key="relatedLinks")
+    fail_reason = fields.Str(required=False, allow_none=True, data_key="failReason")
 
 
 class ItemSerializer(BaseSerializer):
@@ -7,3 +7,15 @@ class SupplySessionSerializer(BaseSerializer):
     id = fields.Int(dump_only=True)
     item_type = fields.Nested("ItemTypeSerializer", data_key="itemType")
     items = fields.Nested("ItemSerializer", exclude=("session",), many=True)
+
+
+class SupplySessionProgressSerializer(BaseSerializer):
+    total = fields.Int()
+    pending = fields.Int()
+    success = fields.Int()
+    failed = fields.Int()
+
+
+class AppliedSupplySessionSerializer(BaseSerializer):
+    id = fields.Int()
+    item_ids = fields.List(fields.Int(), data_key="itemIds")
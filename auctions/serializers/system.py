@@ -0,0 +1,14 @@
+from marshmallow import fields
+
+from auctions.serializers.base import BaseSerializer
+
+
+class PoolStatusSerializer(BaseSerializer):
+    role = fields.Str()
+    size = fields.Int()
+    checked_in = fields.Int(data_key="checkedIn")
+    checked_out = fields.Int(data_key="checkedOut")
+    overflow = fields.Int()
+    checkouts = fields.Int()
+    wait_total_ms = fields.Float(data_key="waitTotalMs")
+    wait_max_ms = fields.Float(data_key="waitMaxMs")
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -14,10 +15,12 @@ from auctions.db.models.bids import Bid
 from auctions.db.models.enum import CreateBidFailReason
 from auctions.db.models.enum import PushEventType
 from auctions.db.models.enum import SortOrder
+from auctions.db.models.invoices import Invoice
 from auctions.db.models.users import User
 from auctions.db.repositories.auction_sets import AuctionSetsRepository
 from auctions.db.repositories.auctions import AuctionsRepository
 from auctions.db.repositories.bids import BidsRepository
+from auctions.db.repositories.invoices import InvoicesRepository
 from auctions.db.repositories.items import ItemsRepository
 from auctions.dependencies import Provide
 from auctions.exceptions import AuctionCloseFailed
@@ -40,6 +43,7 @@ class AuctionsService:
         auctions_repository: AuctionsRepository = Provide(),
         bids_repository: BidsRepository = Provide(),
         items_repository: ItemsRepository = Provide(),
+        invoices_repository: InvoicesRepository = Provide(),
         config: Config = Provide(),
     ) -> None:
         self.crud_service = crud_service
@@ -49,6 +53,7 @@ class AuctionsService:
         self.auctions_repository = auctions_repository
         self.bids_repository = bids_repository
         self.items_repository = items_repository
+        self.invoices_repository = invoices_repository
         self.config = config
 
     def with_user(self, user: User) -> Self:
@@ -144,18 +149,74 @@ class AuctionsService:
 
         return auction
 
-    def check_invoices(self, auctions: list[Auction]) -> None:
-        link_cache = {}
+    def check_invoices(self) -> None:
+        now = datetime.now(timezone.utc)
+        updated_since = None
+        updated_statuses = {}
+        invoice_statuses = self.shop_connect_service.get_updated_invoice_statuses()
 
-        for auction in auctions:
-            if auction.invoice_link not in link_cache:
-                is_invoice_paid = self.shop_connect_service.check_invoice_paid(auction.invoice_id)
-                link_cache[auction.invoice_link] = is_invoice_paid
+        if invoice_statuses is not None:
+            updated_since, updated_statuses = invoice_statuses
 
-            if link_cache[auction.invoice_link]:
-                item = auction.item
-                self.auctions_repository.delete([auction])
-                self.items_repository.delete([item])
+        paid_invoice_ids = self.invoices_repository.get_tracked_ids(
+            [invoice_id for invoice_id, is_paid in updated_statuses.items() if is_paid]
+        )
+        invoices = [
+            invoice
+            for invoice in self.invoices_repository.get_due(now, limit=self.config.invoice_check_batch_size)
+            if invoice.id not in paid_invoice_ids
+        ]
+        unverified_invoice_ids = [
+            invoice.id
+            for invoice in invoices
+            if invoice.id not in updated_statuses and self._needs_direct_check(invoice, updated_since)
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.config.shop_api_workers) as executor:
+            paid_flags = executor.map(self._is_invoice_paid, unverified_invoice_ids)
+            paid_invoice_ids.update(
+                invoice_id for invoice_id, is_paid in zip(unverified_invoice_ids, paid_flags) if is_paid
+            )
+
+        unpaid_by_attempts = defaultdict(list)
+
+        for invoice in invoices:
+            if invoice.id not in paid_invoice_ids:
+                unpaid_by_attempts[invoice.check_attempts].append(invoice.id)
+
+        item_ids = self.auctions_repository.delete_by_invoice_ids(list(paid_invoice_ids))
+        self.items_repository.delete_many(item_ids)
+        self.invoices_repository.delete_many(list(paid_invoice_ids))
+
+        for check_attempts, invoice_ids in unpaid_by_attempts.items():
+            next_check_at = now + timedelta(seconds=self._get_invoice_check_delay(check_attempts))
+            self.invoices_repository.reschedule(invoice_ids, next_check_at, checked_at=now)
+
+        loguru.logger.debug(
+            f"Checked {len(invoices)} due invoices against {len(updated_statuses)} updated orders, "
+            f"{len(unverified_invoice_ids)} fetched directly, {len(paid_invoice_ids)} paid"
+        )
+
+    def _get_invoice_check_delay(self, check_attempts: int) -> int:
+        return min(
+            self.config.invoice_check_interval_s * 2 ** check_attempts,
+            self.config.invoice_check_max_interval_s,
+        )
+
+    def _needs_direct_check(self, invoice: Invoice, updated_since: datetime | None) -> bool:
+        if updated_since is None or invoice.last_checked_at is None or invoice.last_checked_at < updated_since:
+            return True
+
+        # Deleted orders never show up in the updated orders listing, so
+        # invoices at the longest interval are verified one by one.
+        return self._get_invoice_check_delay(invoice.check_attempts) >= self.config.invoice_check_max_interval_s
+
+    def _is_invoice_paid(self, invoice_id: int) -> bool:
+        try:
+            return self.shop_connect_service.check_invoice_paid(invoice_id)
+        except Exception as exception:
+            loguru.logger.warning(f"Could not check invoice {invoice_id}: {exception}")
+            return False
 
     def close_auction_set(self, auction_set: AuctionSet, force: bool = False) -> AuctionSet:
         now = datetime.now(timezone.utc)
@@ -170,15 +231,18 @@ class AuctionsService:
 
         latest_auction_ending = now
         is_not_ended = False
+        expired_auction_ids = []
 
         for auction in auction_set.auctions:
             if auction.ended_at is None:
                 if auction.date_due <= now:
-                    self.close_auction(auction.id, force=True)
+                    expired_auction_ids.append(auction.id)
                 else:
                     is_not_ended = True
                     latest_auction_ending = max([latest_auction_ending, auction.date_due])
 
+        self.auctions_repository.update_many(expired_auction_ids, ended_at=now)
+
         if latest_auction_ending > auction_set.date_due and is_not_ended:
             self.auction_sets_repository.update(auction_set, date_due=latest_auction_ending)
             return auction_set
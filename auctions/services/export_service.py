@@ -1,65 +1,183 @@
-from io import BytesIO
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
+from typing import Callable
+from typing import Iterator
+from zoneinfo import ZoneInfo
 
-from openpyxl import Workbook
-from openpyxl.worksheet.worksheet import Worksheet
+import loguru
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
 
-from auctions.db.models.auctions import Auction
+from auctions.config import Config
+from auctions.db.models.enum import ExportFormat
+from auctions.db.models.enum import ExportJobStatus
+from auctions.db.models.enum import ExportType
+from auctions.db.models.exports import ExportJob
+from auctions.db.repositories.auction_sets import AuctionSetsRepository
 from auctions.db.repositories.auctions import AuctionsRepository
-from auctions.db.repositories.users import UsersRepository
+from auctions.db.repositories.bids import BidsRepository
+from auctions.db.repositories.exports import ExportJobsRepository
 from auctions.dependencies import Provide
+from auctions.exceptions import ExportNotReady
+from auctions.services.schedule_service import ScheduleService
+from auctions.utils.export import writers
+from auctions.utils.files import FileRemover
+
+
+def get_upc(row: Row) -> str:
+    return (row.upca or "") + (row.upc5 or "")
 
 
 class ExportService:
     def __init__(
         self,
+        schedule_service: ScheduleService = Provide(),
+        auction_sets_repository: AuctionSetsRepository = Provide(),
         auctions_repository: AuctionsRepository = Provide(),
-        users_repository: UsersRepository = Provide(),
+        bids_repository: BidsRepository = Provide(),
+        export_jobs_repository: ExportJobsRepository = Provide(),
+        config: Config = Provide(),
     ) -> None:
+        self.schedule_service = schedule_service
+        self.auction_sets_repository = auction_sets_repository
         self.auctions_repository = auctions_repository
-        self.users_repository = users_repository
+        self.bids_repository = bids_repository
+        self.export_jobs_repository = export_jobs_repository
+        self.config = config
+        self.timezone = ZoneInfo(config.default_timezone)
 
         self.empty_fields = {
-            "ID": lambda auction: auction.id,
-            "Название": lambda auction: auction.item.name,
-            "UPC": lambda auction: (auction.item.upca or "") + (auction.item.upc5 or ""),
+            "ID": lambda row: row.id,
+            "Название": lambda row: row.name,
+            "UPC": get_upc,
+        }
+
+        self.winners_fields = {
+            "ID": lambda row: row.id,
+            "Название": lambda row: row.name,
+            "UPC": get_upc,
+            "Победитель": lambda row: row.full_name,
+            "Email": lambda row: row.email,
+            "Телефон": lambda row: row.phone,
+            "Ставка": lambda row: row.value,
+            "Выкуп": lambda row: "да" if row.is_buyout else "нет",
+            "Завершен": lambda row: self.to_local_time(row.ended_at),
+            "Счет": lambda row: row.invoice_link or "",
         }
 
-        # self.winners_fields = {
-        #     "ID": lambda bidder: bidder.id,
-        #     "Имя": lambda bidder: f"{bidder.first_name} {bidder.last_name}",
-        #     ""
-        # }
-
-    def export_empty_auctions(self, set_id: int) -> bytes:
-        empty_auctions = self.auctions_repository.get_many((Auction.set_id == set_id) & ~Auction.bids.any())
-
-        content_buffer = BytesIO()
-
-        workbook = Workbook()
-        worksheet: Worksheet = workbook.active
-
-        worksheet.append(list(self.empty_fields.keys()))
-
-        for auction in empty_auctions:
-            worksheet.append(field(auction) for name, field in self.empty_fields.items())
-
-        workbook.save(content_buffer)
-
-        return content_buffer.getvalue()
-
-    # def export_auction_winners(self, set_id: int) -> bytes:
-    #     auction_winners = self.bidders_repository.get_many((Auction.set_id == set_id) & ~Auction.bids.any())
-    #
-    #     content_buffer = BytesIO()
-    #
-    #     workbook = Workbook()
-    #     worksheet: Worksheet = workbook.active
-    #
-    #     worksheet.append(self.empty_fields.keys())
-    #
-    #     for auction in empty_auctions:
-    #         worksheet.append(field(auction) for name, field in self.empty_fields.items())
-    #
-    #     workbook.save(content_buffer)
-    #
-    #     return content_buffer.getvalue()
+        self.bids_fields = {
+            "ID": lambda row: row.id,
+            "Лот": lambda row: row.auction_id,
+            "Название": lambda row: row.name,
+            "Участник": lambda row: row.full_name,
+            "Email": lambda row: row.email,
+            "Ставка": lambda row: row.value,
+            "Снайпинг": lambda row: "да" if row.is_sniped else "нет",
+            "Выкуп": lambda row: "да" if row.is_buyout else "нет",
+            "Создана": lambda row: self.to_local_time(row.created_at),
+        }
+
+        self.exports: dict[ExportType, tuple[dict[str, Callable[[Row], ...]], Callable[[int], Iterator[Row]]]] = {
+            ExportType.EMPTY: (self.empty_fields, self.auctions_repository.stream_empty_auction_rows),
+            ExportType.WINNERS: (self.winners_fields, self.auctions_repository.stream_winner_rows),
+            ExportType.BIDS: (self.bids_fields, self.bids_repository.stream_set_bid_rows),
+        }
+
+    def to_local_time(self, value: datetime | None) -> datetime | None:
+        # Spreadsheets have no notion of time zones, and openpyxl refuses aware datetimes altogether.
+        if value is None:
+            return None
+
+        return value.astimezone(self.timezone).replace(tzinfo=None)
+
+    def write_export(self, set_id: int, export_type: ExportType, export_format: ExportFormat, file: BinaryIO) -> None:
+        fields, stream_rows = self.exports[export_type]
+        rows = ([field(row) for field in fields.values()] for row in stream_rows(set_id))
+        writers[export_format](file, list(fields.keys()), rows)
+
+    def export(self, set_id: int, export_type: ExportType, export_format: ExportFormat) -> BinaryIO:
+        file = SpooledTemporaryFile(max_size=self.config.export_spool_max_bytes)
+
+        try:
+            self.write_export(set_id, export_type, export_format, file)
+        except Exception:
+            file.close()
+            raise
+
+        file.seek(0)
+        return file
+
+    @staticmethod
+    def get_filename(set_id: int, export_type: ExportType, export_format: ExportFormat) -> str:
+        return f"auction_set_{set_id}_{export_type.value}.{export_format.value}"
+
+    def create_job(self, set_id: int, export_type: ExportType, export_format: ExportFormat) -> ExportJob:
+        self.auction_sets_repository.get_one_by_id(set_id, with_joined_fields=False)
+        job = self.export_jobs_repository.create(set_id=set_id, type=export_type, format=export_format)
+        self.schedule_service.after_commit(
+            self.export_jobs_repository.session,
+            self.schedule_service.run_export_job,
+            job.id,
+            on_failure=lambda session, exception: self._fail_unqueued_job(session, job.id, exception),
+        )
+        return job
+
+    def _fail_unqueued_job(self, session: Session, job_id: int, exception: Exception) -> None:
+        ExportJobsRepository(session, self.config).update_many(
+            [job_id],
+            status=ExportJobStatus.FAILED,
+            error=f"Could not enqueue the export: {exception}",
+            finished_at=datetime.now(timezone.utc),
+        )
+
+    def run_job(self, job: ExportJob) -> ExportJob:
+        if job.status != ExportJobStatus.PENDING:
+            return job
+
+        if job.set_id is None:
+            return self.export_jobs_repository.update(
+                job,
+                status=ExportJobStatus.FAILED,
+                error="Auction set was deleted",
+                finished_at=datetime.now(timezone.utc),
+            )
+
+        filename = f"{job.id}_{self.get_filename(job.set_id, job.type, job.format)}"
+        file_path = (self.config.exports_path / filename).resolve()
+
+        try:
+            with open(file_path, "wb") as file:
+                self.write_export(job.set_id, job.type, job.format, file)
+        except Exception as exception:
+            loguru.logger.exception(f"Export job {job.id} failed")
+            self.export_jobs_repository.session.rollback()
+            file_path.unlink(missing_ok=True)
+            return self.export_jobs_repository.update(
+                job,
+                status=ExportJobStatus.FAILED,
+                error=str(exception),
+                finished_at=datetime.now(timezone.utc),
+            )
+
+        return self.export_jobs_repository.update(
+            job,
+            status=ExportJobStatus.SUCCESS,
+            file_path=str(file_path),
+            finished_at=datetime.now(timezone.utc),
+        )
+
+    def get_job_file_path(self, job: ExportJob) -> str:
+        if job.status != ExportJobStatus.SUCCESS:
+            raise ExportNotReady
+
+        return job.file_path
+
+    def remove_expired_jobs(self) -> None:
+        created_before = datetime.now(timezone.utc) - timedelta(hours=self.config.export_retention_hours)
+        jobs = self.export_jobs_repository.get_created_before(created_before)
+
+        FileRemover.schedule(self.export_jobs_repository.session, [job.file_path for job in jobs if job.file_path])
+        self.export_jobs_repository.delete_many([job.id for job in jobs])
@@ -1,13 +1,16 @@
 import gc
+import json
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
 from mimetypes import guess_extension
 from mimetypes import guess_type
+from multiprocessing import get_context
 from pathlib import Path
-from uuid import uuid4
 
+import loguru
 import pyvips
-from PIL import Image as PillowImage
-from pyzbar.pyzbar import ZBarSymbol
-from pyzbar.pyzbar import decode
+from redis import Redis
+from redis import RedisError
 from werkzeug.formparser import FileStorage
 
 from auctions.config import Config
@@ -15,11 +18,22 @@ from auctions.db.models.images import Image
 from auctions.db.models.items import Item
 from auctions.db.repositories.images import ImagesRepository
 from auctions.dependencies import Provide
+from auctions.utils.barcodes import BarcodeScanResult
+from auctions.utils.barcodes import scan_barcode
+from auctions.utils.files import replace_atomically
 
 
 class ImagesService:
-    def __init__(self, images_repository: ImagesRepository = Provide(), config: Config = Provide()) -> None:
+    barcode_key_prefix = "barcodes"
+
+    def __init__(
+        self,
+        images_repository: ImagesRepository = Provide(),
+        redis: Redis = Provide(),
+        config: Config = Provide(),
+    ) -> None:
         self.images_repository = images_repository
+        self.redis = redis
         self.config = config
 
         self.orientation_rotation_map = {
@@ -39,8 +53,8 @@ class ImagesService:
     def upload_one(self, file: FileStorage) -> Image:
         mime_type, _ = guess_type(file.filename)
         file_extension = guess_extension(mime_type)
-        image_uuid = str(uuid4())
-        file_name = f"{image_uuid}{file_extension}"
+        content_hash = self.hash_content(file)
+        file_name = f"{content_hash}{file_extension}"
 
         urls = {
             "full": self.config.full_images_path / file_name,
@@ -56,23 +70,44 @@ class ImagesService:
             except FileExistsError:
                 pass
 
+        self.images_repository.lock_content_hashes({content_hash})
+        is_stored = (
+            all(path.exists() for path in urls.values())
+            and bool(self.images_repository.get_referenced_hashes({content_hash}))
+        )
+
         try:
-            self.save_and_normalize(file, urls["full"])
-            self.make_thumbs(urls)
+            if is_stored:
+                file.close()
+            else:
+                self.save_and_normalize(file, urls["full"])
+                self.make_thumbs(urls)
 
             return self.images_repository.create(
                 mime_type=mime_type,
                 urls={key: str(value.as_posix()) for key, value in urls.items()},
                 is_main=True,
+                content_hash=content_hash,
             )
         except Exception:
-            for path in urls.values():
-                path.unlink(missing_ok=True)
+            if not is_stored and not self.images_repository.get_referenced_hashes({content_hash}):
+                for path in urls.values():
+                    path.unlink(missing_ok=True)
 
             raise
         finally:
             gc.collect()
 
+    @staticmethod
+    def hash_content(file: FileStorage) -> str:
+        content_hash = blake2b(digest_size=16)
+
+        for chunk in iter(lambda: file.stream.read(65536), b""):
+            content_hash.update(chunk)
+
+        file.stream.seek(0)
+        return content_hash.hexdigest()
+
     @staticmethod
     def save_and_normalize(file: FileStorage, save_path: Path) -> None:
         temp_path = Path(save_path.name).absolute()
@@ -82,7 +117,9 @@ class ImagesService:
         try:
             image = pyvips.Image.new_from_file(str(temp_path))
             image = image.autorot()
-            image.write_to_file(str(save_path), interlace=True, optimize_coding=True, strip=True)
+
+            with replace_atomically(save_path) as target_path:
+                image.write_to_file(str(target_path), interlace=True, optimize_coding=True, strip=True)
         finally:
             temp_path.unlink(missing_ok=True)
 
@@ -93,30 +130,77 @@ class ImagesService:
     @staticmethod
     def make_thumb(source_path: Path, target_path: Path, thumbnail_data: dict[str, ...]) -> None:
         thumb = pyvips.Image.thumbnail(str(source_path), thumbnail_data["bounds"][0])
-        thumb.write_to_file(str(target_path))
 
-    @staticmethod
-    def scan_barcode(image: Image) -> tuple[str | None, str | None]:
-        pillow_image = PillowImage.open(image.urls["full"])
+        with replace_atomically(target_path) as temp_path:
+            thumb.write_to_file(str(temp_path))
+
+    def scan_barcode(self, image: Image) -> BarcodeScanResult:
+        return self.scan_barcodes([image])[0]
+
+    def scan_barcodes(self, images: list[Image]) -> list[BarcodeScanResult]:
+        paths = list(dict.fromkeys(image.urls["full"] for image in images))
 
-        codes = decode(pillow_image, symbols=[ZBarSymbol.EAN13, ZBarSymbol.EAN5, ZBarSymbol.UPCA])
+        if not paths:
+            return []
 
-        del pillow_image
-        gc.collect()
+        content_hashes = {image.urls["full"]: image.content_hash for image in images}
+        results = self._get_cached_barcodes(content_hashes)
+        missing_paths = [path for path in paths if path not in results]
 
-        upca = None
-        ean13 = None
-        ean5 = None
+        if len(missing_paths) == 1:
+            results[missing_paths[0]] = scan_barcode(missing_paths[0])
+        elif missing_paths:
+            with ProcessPoolExecutor(
+                max_workers=self.config.scan_workers,
+                mp_context=get_context("spawn"),
+            ) as executor:
+                results |= dict(zip(missing_paths, executor.map(scan_barcode, missing_paths)))
 
-        for code in codes:
-            if code.type == "UPCA":
-                upca = code.data.decode("utf-8")
-            elif code.type == "EAN13":
-                ean13 = code.data.decode("utf-8")
-            elif code.type == "EAN5":
-                ean5 = code.data.decode("utf-8")
+        self._cache_barcodes({content_hashes[path]: results[path] for path in missing_paths})
+        return [results[image.urls["full"]] for image in images]
 
-        return upca or ean13, ean5
+    def _get_cached_barcodes(self, content_hashes: dict[str, str | None]) -> dict[str, BarcodeScanResult]:
+        hashed_paths = [(path, content_hash) for path, content_hash in content_hashes.items() if content_hash]
+
+        if not hashed_paths:
+            return {}
+
+        try:
+            cached = self.redis.mget([f"{self.barcode_key_prefix}:{content_hash}" for _, content_hash in hashed_paths])
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not read cached barcodes: {exception}")
+            return {}
+
+        return {
+            path: tuple(json.loads(result))
+            for (path, _), result in zip(hashed_paths, cached)
+            if result is not None
+        }
+
+    def _cache_barcodes(self, results: dict[str | None, BarcodeScanResult]) -> None:
+        # Misses are not cached, so a later scanner fix or a better image can still find the barcode.
+        results = {
+            content_hash: result
+            for content_hash, result in results.items()
+            if content_hash and result[0] is not None
+        }
+
+        if not results:
+            return
+
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+
+            for content_hash, result in results.items():
+                pipeline.set(
+                    f"{self.barcode_key_prefix}:{content_hash}",
+                    json.dumps(result),
+                    ex=self.config.barcode_cache_ttl_hours * 60 * 60,
+                )
+
+            pipeline.execute()
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not cache barcodes: {exception}")
 
     def delete_for_item(self, item: Item) -> None:
         self.images_repository.delete(item.images)
@@ -1,11 +1,13 @@
-from collections import defaultdict
-
 from auctions.config import Config
 from auctions.db.models.enum import SupplyItemParseStatus
+from auctions.db.models.item_types import ItemType
 from auctions.db.models.items import Item
+from auctions.db.models.price_categories import PriceCategory
 from auctions.db.repositories.items import ItemsRepository
 from auctions.db.repositories.item_types import ItemTypesRepository
+from auctions.db.repositories.price_categories import PriceCategoriesRepository
 from auctions.dependencies import Provide
+from auctions.utils.counters import ItemCountersCache
 
 
 class ItemsService:
@@ -13,10 +15,14 @@ class ItemsService:
         self,
         items_repository: ItemsRepository = Provide(),
         item_types_repository: ItemTypesRepository = Provide(),
+        price_categories_repository: PriceCategoriesRepository = Provide(),
+        item_counters_cache: ItemCountersCache = Provide(),
         config: Config = Provide(),
     ) -> None:
         self.items_repository = items_repository
         self.item_types_repository = item_types_repository
+        self.price_categories_repository = price_categories_repository
+        self.item_counters_cache = item_counters_cache
         self.config = config
 
     def list_items(self, filters: dict[str, ...]) -> list[Item]:
@@ -36,38 +42,45 @@ class ItemsService:
         return self.items_repository.get_many(filter_predicate, page=page, page_size=page_size)
 
     def get_counters(self) -> list[dict[str, ...]]:
-        item_types = self.item_types_repository.get_many(with_pagination=False)
-
-        counters = []
-        price_categories = {}
-
-        for item_type in item_types:
-            price_categories_counters = defaultdict(int)
-
-            counter = {
-                "item_type": item_type,
-                "prices": [],
-            }
-
-            for item in item_type.items:
-                if item.auction is not None:
-                    continue
-
-                if item.price_category.id not in price_categories:
-                    price_categories[item.price_category.id] = item.price_category
+        rows = self.item_counters_cache.get()
+
+        if rows is None:
+            rows = self.items_repository.count_available_by_type_and_price()
+            self.item_counters_cache.set(rows)
+
+        if not rows:
+            return []
+
+        # Cached rows may still reference a type or a category deleted since, so these are looked up
+        # without the strict ids check and the rows they no longer match are skipped.
+        item_types = {
+            item_type.id: item_type
+            for item_type in self.item_types_repository.get_many(
+                ItemType.id.in_({row[0] for row in rows}),
+                with_pagination=False,
+            )
+        }
+        price_categories = {
+            price_category.id: price_category
+            for price_category in self.price_categories_repository.get_many(
+                PriceCategory.id.in_({row[1] for row in rows}),
+                with_pagination=False,
+            )
+        }
 
-                price_categories_counters[item.price_category.id] += 1
+        counters = {}
 
-            for price_category_id in price_categories_counters:
-                counter["prices"].append({
-                    "price_category": price_categories[price_category_id],
-                    "count": price_categories_counters[price_category_id],
-                })
+        for item_type_id, price_category_id, count in rows:
+            if item_type_id not in item_types or price_category_id not in price_categories:
+                continue
 
-            if counter["prices"]:
-                counters.append(counter)
+            counter = counters.setdefault(item_type_id, {"item_type": item_types[item_type_id], "prices": []})
+            counter["prices"].append({
+                "price_category": price_categories[price_category_id],
+                "count": count,
+            })
 
-        return counters
+        return list(counters.values())
 
     def get_random_set(self, amounts: dict[int, dict[int, int]]) -> list[Item]:
         return self.items_repository.get_random_set(amounts)
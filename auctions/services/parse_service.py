@@ -1,23 +1,38 @@
 import re
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from datetime import datetime
+from datetime import timedelta
 from datetime import timezone
 from string import ascii_uppercase
+from typing import Callable
 from urllib.parse import urlencode
 
 import requests
 from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from bs4 import Tag  # noqa
 from dateutil.relativedelta import relativedelta
 
+from auctions.config import Config
 from auctions.db.models.enum import SupplyItemParseStatus
 from auctions.db.models.items import Item
 from auctions.db.models.price_categories import PriceCategory
 from auctions.db.repositories.item_types import ItemTypesRepository
 from auctions.db.repositories.price_categories import PriceCategoriesRepository
+from auctions.db.repositories.upc_lookups import UpcLookupsRepository
 from auctions.dependencies import Provide
-from auctions.exceptions import ObjectDoesNotExist
 from auctions.exceptions import TooManyImages
 from auctions.services.images_service import ImagesService
+from auctions.utils.html import parse_html
+from auctions.utils.price_categories import PriceCategoryIndex
+from auctions.utils.scraping import HostUnavailableError
+from auctions.utils.scraping import ScrapingClient
+
+BARCODE_PAGE_STRAINER = SoupStrainer("table", class_="listing")
+COVER_GALLERY_STRAINER = SoupStrainer(class_="cover_number")
+CONDITION_PRICES_STRAINER = SoupStrainer(id="resultstab")
 
 
 class ParseService:
@@ -26,10 +41,18 @@ class ParseService:
         images_service: ImagesService = Provide(),
         item_types_repository: ItemTypesRepository = Provide(),
         price_categories_repository: PriceCategoriesRepository = Provide(),
+        upc_lookups_repository: UpcLookupsRepository = Provide(),
+        scraping_client: ScrapingClient = Provide(),
+        price_category_index: PriceCategoryIndex = Provide(),
+        config: Config = Provide(),
     ) -> None:
         self.images_service = images_service
         self.item_types_repository = item_types_repository
         self.price_categories_repository = price_categories_repository
+        self.upc_lookups_repository = upc_lookups_repository
+        self.scraping_client = scraping_client
+        self.price_category_index = price_category_index
+        self.config = config
 
         self.stashmycomics_url = "https://stashmycomics.com/"
         self.stashmycomics_series_search_url = "searchpreresults.asp"
@@ -55,25 +78,144 @@ class ParseService:
 
         return self.parse_item_data(item)
 
+    def process_items(self, items: list[Item], on_processed: Callable[[Item], None] | None = None) -> list[Item]:
+        on_processed = on_processed or (lambda item: None)
+        to_parse = []
+
+        self.price_category_index.refresh()
+
+        for item in items:
+            if len(item.images) > 1:
+                item.parse_status = SupplyItemParseStatus.FAILED
+                on_processed(item)
+            else:
+                to_parse.append(item)
+
+        to_scan = [item for item in to_parse if not item.upca and not item.upc5]
+        scan_results = self.images_service.scan_barcodes([item.images[0] for item in to_scan])
+
+        for item, (upca, upc5) in zip(to_scan, scan_results):
+            item.upca, item.upc5 = upca, upc5
+
+        items_by_upc: dict[str, list[Item]] = {}
+
+        for item in to_parse:
+            if None in (item.upca, item.upc5):
+                item.parse_status = SupplyItemParseStatus.FAILED
+                on_processed(item)
+            else:
+                items_by_upc.setdefault(item.upca + item.upc5, []).append(item)
+
+        for upc, parsed_data in self.get_cached_barcode_data(list(items_by_upc)).items():
+            for item in items_by_upc.pop(upc):
+                self.apply_parsed_data(item, parsed_data)
+                on_processed(item)
+
+        with ThreadPoolExecutor(max_workers=self.config.parse_workers) as executor:
+            futures = {executor.submit(self._fetch_barcode_data, upc): upc for upc in items_by_upc}
+
+            for future in as_completed(futures):
+                try:
+                    parsed_data = future.result()
+                    fail_reason = None
+                except Exception as exception:
+                    parsed_data = None
+                    fail_reason = self._get_fail_reason(exception)
+                else:
+                    self.store_barcode_data(futures[future], parsed_data)
+
+                for item in items_by_upc[futures[future]]:
+                    if parsed_data is None:
+                        self._mark_failed(item, fail_reason)
+                    else:
+                        self.apply_parsed_data(item, parsed_data)
+
+                    on_processed(item)
+
+        return items
+
     def parse_item_data(self, item: Item) -> Item:
         if None in (item.upca, item.upc5):
             item.parse_status = SupplyItemParseStatus.FAILED
             return item
 
-        try:
-            parsed_data = self._fetch_barcode_data(item.upca + item.upc5)
-        except Exception:
-            item.parse_status = SupplyItemParseStatus.FAILED
-            return item
+        self.price_category_index.refresh()
+
+        upc = item.upca + item.upc5
+        parsed_data = self.get_cached_barcode_data([upc]).get(upc)
+
+        if parsed_data is None:
+            try:
+                parsed_data = self._fetch_barcode_data(upc)
+            except Exception as exception:
+                return self._mark_failed(item, self._get_fail_reason(exception))
+
+            self.store_barcode_data(upc, parsed_data)
+
+        return self.apply_parsed_data(item, parsed_data)
+
+    @staticmethod
+    def _get_fail_reason(exception: Exception) -> str:
+        if isinstance(exception, HostUnavailableError):
+            return str(exception)
+
+        return f"{exception.__class__.__name__}: {exception}"
+
+    @staticmethod
+    def _mark_failed(item: Item, reason: str) -> Item:
+        item.parse_status = SupplyItemParseStatus.FAILED
+        item.parse_data = {**item.parse_data, "fail_reason": reason}
+        return item
+
+    def get_cached_barcode_data(self, upcs: list[str]) -> dict[str, dict[str, ...]]:
+        return {
+            upc: self._load_barcode_data(lookup.data)
+            for upc, lookup in self.upc_lookups_repository.get_fresh(upcs).items()
+        }
 
+    def store_barcode_data(self, upc: str, parsed_data: dict[str, ...]) -> None:
+        is_found = parsed_data.get("status") == SupplyItemParseStatus.SUCCESS
+        ttl_hours = self.config.upc_lookup_ttl_hours if is_found else self.config.upc_lookup_negative_ttl_hours
+
+        self.upc_lookups_repository.store(
+            upc,
+            self._dump_barcode_data(parsed_data),
+            is_found=is_found,
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=ttl_hours),
+        )
+
+    @staticmethod
+    def _dump_barcode_data(parsed_data: dict[str, ...]) -> dict[str, ...]:
+        data = dict(parsed_data)
+        data["status"] = parsed_data.get("status", SupplyItemParseStatus.FAILED).value
+
+        if data.get("release_date") is not None:
+            data["release_date"] = data["release_date"].isoformat()
+
+        return data
+
+    @staticmethod
+    def _load_barcode_data(data: dict[str, ...]) -> dict[str, ...]:
+        parsed_data = dict(data)
+        parsed_data["status"] = SupplyItemParseStatus(data.get("status", SupplyItemParseStatus.FAILED.value))
+
+        if parsed_data.get("release_date") is not None:
+            parsed_data["release_date"] = datetime.fromisoformat(parsed_data["release_date"])
+
+        return parsed_data
+
+    def apply_parsed_data(self, item: Item, parsed_data: dict[str, ...]) -> Item:
         if parsed_data.get("series_name") and parsed_data.get("issue_number"):
             item.name = f'{parsed_data["series_name"]} #{parsed_data["issue_number"]}'.upper()
 
-        item.parse_data["publisher"] = parsed_data.get("publisher")
-        item.parse_data["release_date"] = parsed_data.get("release_date")
-        item.parse_data["cover_price"] = parsed_data.get("cover_price")
-        item.parse_data["condition_prices"] = parsed_data.get("condition_prices", {})
-        item.parse_data["related_links"] = parsed_data.get("related_links", [])
+        parse_data = dict(item.parse_data)
+        parse_data.pop("fail_reason", None)
+        parse_data["publisher"] = parsed_data.get("publisher")
+        parse_data["release_date"] = parsed_data.get("release_date")
+        parse_data["cover_price"] = parsed_data.get("cover_price")
+        parse_data["condition_prices"] = parsed_data.get("condition_prices", {})
+        parse_data["related_links"] = parsed_data.get("related_links", [])
+        item.parse_data = parse_data
         item.description = parsed_data.get("description", "")
         item.price_category = item.session.item_type.price_category
 
@@ -90,8 +232,8 @@ class ParseService:
     def _parse_item_data_alternative(self, upc: str) -> dict:
         parsed_data: dict[str, ...] = {"status": SupplyItemParseStatus.SUCCESS}
 
-        response = requests.get(f"{self.stashmycomics_series_search_page}?upc={upc}")
-        page = BeautifulSoup(response.text)
+        response = self.scraping_client.get(f"{self.stashmycomics_series_search_page}?upc={upc}")
+        page = parse_html(response.text)
 
         link_element = page.select_one("#TitleResults a")
 
@@ -112,8 +254,8 @@ class ParseService:
 
         parsed_data["series_name"] = link_element.text.strip()
 
-        response = requests.get(f"{self.stashmycomics_url}{link}")
-        page = BeautifulSoup(response.text)
+        response = self.scraping_client.get(f"{self.stashmycomics_url}{link}")
+        page = parse_html(response.text)
 
         table_columns = page.select("#IssueResults tbody td")
 
@@ -149,8 +291,8 @@ class ParseService:
 
         parsed_data["issue_id"] = issue_id.groups()[0]
 
-        response = requests.get(f"{self.stashmycomics_url}{link}")
-        page = BeautifulSoup(response.text)
+        response = self.scraping_client.get(f"{self.stashmycomics_url}{link}")
+        page = parse_html(response.text)
 
         try:
             cover_price_element = page.select("section.row")[1]
@@ -165,9 +307,11 @@ class ParseService:
 
         parsed_data_ = self._parse_item_condition_prices(
             parsed_data,
-            parsed_data["series_name"],
-            parsed_data["issue_number"],
-            parsed_data.get("release_date").year if "release_date" in parsed_data else None,
+            self._request_condition_prices(
+                parsed_data["series_name"],
+                parsed_data["issue_number"],
+                parsed_data.get("release_date"),
+            ),
         )
 
         parsed_data_.setdefault("related_links", []).extend(parsed_data.get("related_links", []))
@@ -178,8 +322,8 @@ class ParseService:
     def _fetch_barcode_data(self, upc: str) -> dict[str, ...]:
         parsed_data: dict[str, ...] = {"status": SupplyItemParseStatus.SUCCESS}
 
-        response = requests.get(f"https://www.comics.org/barcode/{upc}/")
-        page = BeautifulSoup(response.text)
+        response = self.scraping_client.get(f"https://www.comics.org/barcode/{upc}/")
+        page = parse_html(response.text, BARCODE_PAGE_STRAINER)
 
         table_rows: list[Tag] = page.select("table.listing tr")
 
@@ -198,8 +342,8 @@ class ParseService:
 
         issue_link = issue_links[-1].get("href")
 
-        response = requests.get(f"{self.alternative_url}{issue_link}")
-        page = BeautifulSoup(response.text)
+        response = self.scraping_client.get(f"{self.alternative_url}{issue_link}")
+        page = parse_html(response.text)
 
         price_element = page.select_one("#issue_price")
 
@@ -231,31 +375,6 @@ class ParseService:
 
         parsed_data["series_name"] = series_name.text.strip()
 
-        issue_number = series_and_issue.select_one("span.issue_number")
-
-        if issue_number is None:
-            parsed_data["issue_number"] = ""
-            parsed_data["issue_variant"] = ""
-        else:
-            parsed_data["issue_number"] = issue_number.text.strip().replace("#", "")
-
-            series_and_issue_last_child = list(series_and_issue.children)[-1].strip()
-
-            issue_level_content = page.select_one(".issue_level_content")
-
-            if issue_level_content is not None and "This issue has variants" in issue_level_content.text:
-                parsed_data["issue_variant"] = "A"
-            else:
-                parsed_data["issue_variant"] = self._parse_item_variant_from_cover_gallery(
-                    page,
-                    parsed_data["issue_number"],
-                    series_and_issue_last_child.strip(),
-                )
-
-                if parsed_data["issue_variant"] is None:
-                    parsed_data["status"] = SupplyItemParseStatus.FAILED
-                    return parsed_data
-
         publisher = page.select_one("#issue_indicia_publisher")
 
         if publisher is not None:
@@ -276,13 +395,40 @@ class ParseService:
             else:
                 parsed_data["release_date"] = None
 
-        parsed_data_ = self._parse_item_condition_prices(
-            parsed_data,
+        issue_number = series_and_issue.select_one("span.issue_number")
+        parsed_data["issue_number"] = "" if issue_number is None else issue_number.text.strip().replace("#", "")
+
+        condition_prices_request = self._request_condition_prices(
             parsed_data["series_name"],
             parsed_data["issue_number"],
-            parsed_data.get("release_date").year if "release_date" in parsed_data else None,
+            parsed_data.get("release_date"),
         )
 
+        if issue_number is None:
+            parsed_data["issue_variant"] = ""
+        else:
+            series_and_issue_last_child = list(series_and_issue.children)[-1].strip()
+
+            issue_level_content = page.select_one(".issue_level_content")
+
+            if issue_level_content is not None and "This issue has variants" in issue_level_content.text:
+                parsed_data["issue_variant"] = "A"
+            else:
+                parsed_data["issue_variant"] = self._parse_item_variant_from_cover_gallery(
+                    page,
+                    parsed_data["issue_number"],
+                    series_and_issue_last_child.strip(),
+                )
+
+                if parsed_data["issue_variant"] is None:
+                    if condition_prices_request is not None:
+                        condition_prices_request[1].cancel()
+
+                    parsed_data["status"] = SupplyItemParseStatus.FAILED
+                    return parsed_data
+
+        parsed_data_ = self._parse_item_condition_prices(parsed_data, condition_prices_request)
+
         parsed_data_.setdefault("related_links", []).extend(parsed_data.get("related_links", []))
         parsed_data |= parsed_data_
 
@@ -299,8 +445,8 @@ class ParseService:
         if issue_cover_gallery is None:
             return ""
 
-        response = requests.get(f'{self.alternative_url}{issue_cover_gallery.get("href")}')
-        page_ = BeautifulSoup(response.text)
+        response = self.scraping_client.get(f'{self.alternative_url}{issue_cover_gallery.get("href")}')
+        page_ = parse_html(response.text, COVER_GALLERY_STRAINER)
 
         cover_list = list(
             map(
@@ -322,28 +468,37 @@ class ParseService:
 
         return ascii_uppercase[cover_index]
 
-    @staticmethod
-    def _parse_item_condition_prices(
-        parsed_data: dict,
+    def _request_condition_prices(
+        self,
         series_name: str,
         issue_number: str,
-        release_year: int | None,
-    ) -> dict[str, ...]:
-        if release_year is None:
-            return {}
-
-        parsed_data_: dict[str, ...] = {"condition_prices": {}}
+        release_date: datetime | None,
+    ) -> tuple[str, Future[requests.Response]] | None:
+        if release_date is None:
+            return None
 
         query_params = {
             "q": f"{series_name.lower()} #{issue_number}",
-            "minyr": release_year - 1,
-            "maxyr": release_year + 1,
+            "minyr": release_date.year - 1,
+            "maxyr": release_date.year + 1,
         }
 
         url = f"https://www.mycomicshop.com/search?{urlencode(query_params)}"
+        return url, self.scraping_client.submit(url)
+
+    @staticmethod
+    def _parse_item_condition_prices(
+        parsed_data: dict,
+        condition_prices_request: tuple[str, Future[requests.Response]] | None,
+    ) -> dict[str, ...]:
+        if condition_prices_request is None:
+            return {}
+
+        parsed_data_: dict[str, ...] = {"condition_prices": {}}
 
-        response = requests.get(url)
-        page = BeautifulSoup(response.text)
+        url, response_future = condition_prices_request
+        response = response_future.result()
+        page = parse_html(response.text, CONDITION_PRICES_STRAINER)
 
         issues = page.select("#resultstab .issue")
         issue_element = next(
@@ -397,50 +552,46 @@ class ParseService:
         if item.parse_data.get("cover_price") is None or item.parse_data.get("release_date") is None:
             return None
 
-        release_date = item.parse_data["release_date"].astimezone(timezone.utc)
-
-        if release_date + relativedelta(months=6) >= datetime.now(timezone.utc):
-            acceptable_conditions = ["Near Mint", "Very Fine"]
-            min_price_delta = 2
-            to_pass = True
-            price_map = {
-                3.99: 400,
-                4.99: 500,
-                5.99: 600,
-                6.99: 600,
-                7.99: 800,
-                8.99: 800,
-                9.99: 800,
-            }
-        else:
-            acceptable_conditions = ["Near Mint", "Very Fine", "Fine", "Very Good"]
-            min_price_delta = 3
-            to_pass = False
-            price_map = {
-                4: 400,
-                3.5: 350,
-                3: 300,
-                2.5: 250,
-                2: 200,
-            }
-
-        for condition in acceptable_conditions:
+        price_rule = self._get_price_rule(item.parse_data["release_date"].astimezone(timezone.utc))
+
+        if price_rule is None:
+            return None
+
+        for condition in price_rule["acceptable_conditions"]:
             if condition not in item.parse_data["condition_prices"]:
                 continue
 
             if (
-                item.parse_data["condition_prices"][condition] + min_price_delta >= item.parse_data["cover_price"]
-            ) != to_pass:
+                item.parse_data["condition_prices"][condition] + price_rule["min_price_delta"]
+                >= item.parse_data["cover_price"]
+            ) != price_rule["use_cover_price"]:
                 return None
 
-            base_price = item.parse_data["cover_price"] if to_pass else item.parse_data["condition_prices"][condition]
+            if price_rule["use_cover_price"]:
+                base_price = item.parse_data["cover_price"]
+            else:
+                base_price = item.parse_data["condition_prices"][condition]
 
-            try:
-                return self.price_categories_repository.get_one(
-                    (PriceCategory.usd == base_price)
-                    & (PriceCategory.rub == price_map.get(base_price)),
-                )
-            except ObjectDoesNotExist:
-                pass
+            rub = price_rule["prices"].get(round(base_price, 2))
+
+            if rub is None:
+                continue
+
+            price_category = self.price_category_index.get(self.price_categories_repository, base_price, rub)
+
+            if price_category is not None:
+                return price_category
+
+        return None
+
+    def _get_price_rule(self, release_date: datetime) -> dict[str, ...] | None:
+        now = datetime.now(timezone.utc)
+
+        for price_rule in self.config.price_rules:
+            if price_rule["max_age_months"] is None:
+                return price_rule
+
+            if release_date + relativedelta(months=price_rule["max_age_months"]) >= now:
+                return price_rule
 
         return None
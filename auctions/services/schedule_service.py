@@ -2,11 +2,57 @@ from functools import wraps
 from typing import Callable
 
 import dramatiq
+import loguru
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from auctions.db.models.enum import PushEventType
 
 
 class ScheduleService:
+    pending_key = "pending_messages"
+
+    @classmethod
+    def after_commit(
+        cls,
+        session: Session,
+        send: Callable,
+        *args,
+        on_failure: Callable[[Session, Exception], None] | None = None,
+        **kwargs,
+    ) -> None:
+        session.info.setdefault(cls.pending_key, []).append((send, args, kwargs, on_failure))
+
+    @classmethod
+    def _on_commit(cls, session: Session) -> None:
+        for send, args, kwargs, on_failure in session.info.pop(cls.pending_key, []):
+            try:
+                send(*args, **kwargs)
+            except Exception as exception:
+                loguru.logger.exception(f"Could not enqueue {send.__name__}{args}")
+
+                if on_failure is not None:
+                    cls._handle_failure(session, on_failure, exception)
+
+    @staticmethod
+    def _handle_failure(
+        session: Session,
+        on_failure: Callable[[Session, Exception], None],
+        exception: Exception,
+    ) -> None:
+        # The committed session cannot emit SQL from inside after_commit, so the rows left waiting
+        # for the message are updated in a separate short transaction.
+        try:
+            with Session(bind=session.get_bind()) as failure_session:
+                on_failure(failure_session, exception)
+                failure_session.commit()
+        except Exception:
+            loguru.logger.exception("Could not record an enqueue failure")
+
+    @classmethod
+    def _on_rollback(cls, session: Session) -> None:
+        session.info.pop(cls.pending_key, None)
+
     @staticmethod
     def actor_mimic(func: Callable) -> Callable:
         @wraps(func)
@@ -43,3 +89,22 @@ class ScheduleService:
     @actor_mimic
     def try_close_auction_sets() -> None:
         ...
+
+    @staticmethod
+    @actor_mimic
+    def process_supply_session(session_id: int) -> None:
+        ...
+
+    @staticmethod
+    @actor_mimic
+    def run_export_job(job_id: int) -> None:
+        ...
+
+    @staticmethod
+    @actor_mimic
+    def remove_expired_exports() -> None:
+        ...
+
+
+event.listen(Session, "after_commit", ScheduleService._on_commit)
+event.listen(Session, "after_rollback", ScheduleService._on_rollback)
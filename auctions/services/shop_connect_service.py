@@ -1,9 +1,19 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
 import loguru
+import requests
+from redis import Redis
+from redis import RedisError
 
 from auctions.config import Config
 from auctions.db.models.auctions import Auction
 from auctions.db.models.users import User
 from auctions.db.repositories.auctions import AuctionsRepository
+from auctions.db.repositories.invoices import InvoicesRepository
 from auctions.dependencies import Provide
 from auctions.exceptions import ConflictError
 from auctions.exceptions import NotAuthorizedError
@@ -11,6 +21,7 @@ from auctions.serializers.users import UserInfo
 from auctions.services.password_service import PasswordService
 from auctions.services.schedule_service import ScheduleService
 from auctions.utils.insales import InsalesApi
+from auctions.utils.rate_limit import TokenBucket
 
 
 class ShopConnectService:
@@ -22,22 +33,36 @@ class ShopConnectService:
         "phone",
         "client_group_id",
     ]
+    idempotency_key_prefix = "insales:idempotency"
+    orders_synced_at_key = "insales:orders:synced_at"
+    orders_sync_overlap = timedelta(minutes=1)
 
     def __init__(
         self,
         password_service: PasswordService = Provide(),
         schedule_service: ScheduleService = Provide(),
         auctions_repository: AuctionsRepository = Provide(),
+        invoices_repository: InvoicesRepository = Provide(),
+        redis: Redis = Provide(),
         config: Config = Provide(),
     ) -> None:
         self.password_service = password_service
         self.schedule_service = schedule_service
         self.auctions_repository = auctions_repository
+        self.invoices_repository = invoices_repository
+        self.redis = redis
         self.config = config
         self.api = InsalesApi(
             self.config.shop_id,
             self.config.shop_api_key,
             self.config.shop_api_secret,
+            rate_limiter=TokenBucket(
+                self.redis,
+                f"insales:requests:{self.config.shop_id}",
+                rate=self.config.shop_api_requests_per_minute / 60,
+                capacity=self.config.shop_api_burst,
+            ),
+            retries=self.config.shop_api_retries,
         )
 
     def get_user_info(self, user_id: int) -> dict[str, ...]:
@@ -68,38 +93,107 @@ class ShopConnectService:
         if "country" not in shipping_address or not shipping_address["country"]:
             shipping_address["country"] = "RU"
 
-        shop_product_ids = []
-
-        for auction in auctions:
-            product_id = self.api.create_product(
-                title=auction.item.name,
-                category_id=self.config.shop_category_id,
-                price=auction.get_last_bid().value,
-            )
+        products = [(auction.id, auction.item.name, auction.get_last_bid().value) for auction in auctions]
 
-            shop_product_ids.append(product_id)
+        with ThreadPoolExecutor(max_workers=self.config.shop_api_workers) as executor:
+            shop_product_ids = list(executor.map(lambda product: self._create_product_once(*product), products))
 
         loguru.logger.debug(f"Created products in InSales: {shop_product_ids}")
 
-        order = self.api.create_order(
-            product_ids=shop_product_ids,
-            client=shop_user_info,
-            shipping_address=shipping_address,
-            delivery_variant_id=self.config.shop_delivery_variant_id,
-            payment_gateway_id=self.config.shop_payment_gateway_id,
-            status=self.config.shop_order_status_permalink,
+        order_idempotency_key = f"order:{','.join(str(auction_id) for auction_id, _, _ in sorted(products))}"
+        order = self._get_idempotent_result(order_idempotency_key)
+
+        if order is None:
+            order = self.api.create_order(
+                product_ids=shop_product_ids,
+                client=shop_user_info,
+                shipping_address=shipping_address,
+                delivery_variant_id=self.config.shop_delivery_variant_id,
+                payment_gateway_id=self.config.shop_payment_gateway_id,
+                status=self.config.shop_order_status_permalink,
+            )
+            self._store_idempotent_result(order_idempotency_key, {"id": order["id"], "key": order["key"]})
+
+        invoice_link = f"https://edgecomics.ru/orders/{order['key']}"
+        self.auctions_repository.update_many(
+            [auction.id for auction in auctions],
+            invoice_id=order["id"],
+            invoice_link=invoice_link,
+        )
+        now = datetime.now(timezone.utc)
+        self.invoices_repository.track(
+            order["id"],
+            invoice_link,
+            next_check_at=now + timedelta(seconds=self.config.invoice_check_interval_s),
+            checked_at=now,
         )
 
-        for auction in auctions:
-            self.auctions_repository.update(
-                auction,
-                invoice_id=order["id"],
-                invoice_link=f"https://edgecomics.ru/orders/{order['key']}",
+    def _create_product_once(self, auction_id: int, title: str, price: int) -> int:
+        idempotency_key = f"product:{auction_id}"
+        product_id = self._get_idempotent_result(idempotency_key)
+
+        if product_id is None:
+            product_id = self.api.create_product(title=title, category_id=self.config.shop_category_id, price=price)
+            self._store_idempotent_result(idempotency_key, product_id)
+
+        return product_id
+
+    def _get_idempotent_result(self, idempotency_key: str) -> ...:
+        try:
+            result = self.redis.get(f"{self.idempotency_key_prefix}:{idempotency_key}")
+        except RedisError as exception:
+            # Without the key a retried attempt cannot tell whether it already created the object, so it fails instead
+            loguru.logger.error(f"Could not read idempotency key {idempotency_key}: {exception}")
+            raise
+
+        return None if result is None else json.loads(result)
+
+    def _store_idempotent_result(self, idempotency_key: str, result: ...) -> None:
+        try:
+            self.redis.set(
+                f"{self.idempotency_key_prefix}:{idempotency_key}",
+                json.dumps(result),
+                ex=self.config.shop_idempotency_ttl_hours * 60 * 60,
             )
+        except RedisError as exception:
+            loguru.logger.error(f"Could not store idempotency key {idempotency_key}: {exception}")
+            raise
 
     def check_invoice_paid(self, invoice_id: int) -> bool:
         try:
             order = self.api.get_order(invoice_id)
-            return order.get("financial_status", "") == "paid"
+            return self._is_order_paid(order)
         except InsalesApi.RequestFailedError as exception:
             return exception.status_code == 404
+
+    def get_updated_invoice_statuses(self) -> tuple[datetime, dict[int, bool]] | None:
+        synced_at = datetime.now(timezone.utc)
+        updated_since = self._get_orders_synced_at(default=synced_at - timedelta(
+            seconds=self.config.invoice_check_max_interval_s,
+        )) - self.orders_sync_overlap
+
+        try:
+            orders = self.api.list_orders(updated_since)
+        except (InsalesApi.RequestFailedError, requests.RequestException) as exception:
+            loguru.logger.warning(f"Could not list orders updated since {updated_since}: {exception}")
+            return None
+
+        try:
+            self.redis.set(self.orders_synced_at_key, synced_at.isoformat())
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not store orders sync time: {exception}")
+
+        return updated_since, {order["id"]: self._is_order_paid(order) for order in orders}
+
+    def _get_orders_synced_at(self, default: datetime) -> datetime:
+        try:
+            synced_at = self.redis.get(self.orders_synced_at_key)
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not read orders sync time: {exception}")
+            return default
+
+        return default if synced_at is None else max(datetime.fromisoformat(synced_at.decode()), default)
+
+    @staticmethod
+    def _is_order_paid(order: dict[str, ...]) -> bool:
+        return order.get("financial_status", "") == "paid"
@@ -1,3 +1,10 @@
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
 from auctions.db.models.enum import SupplyItemParseStatus
 from auctions.db.models.images import Image
 from auctions.db.models.item_types import ItemType
@@ -13,13 +20,17 @@ from auctions.exceptions import ItemProcessingFailed
 from auctions.exceptions import SessionApplyFailed
 from auctions.services.images_service import ImagesService
 from auctions.services.parse_service import ParseService
+from auctions.services.schedule_service import ScheduleService
 
 
 class SupplyService:
+    processing_time_limit = timedelta(hours=1)
+
     def __init__(
         self,
         images_service: ImagesService = Provide(),
         parse_service: ParseService = Provide(),
+        schedule_service: ScheduleService = Provide(),
         images_repository: ImagesRepository = Provide(),
         item_types_repository: ItemTypesRepository = Provide(),
         items_repository: ItemsRepository = Provide(),
@@ -27,41 +38,82 @@ class SupplyService:
     ) -> None:
         self.images_service = images_service
         self.parse_service = parse_service
+        self.schedule_service = schedule_service
         self.images_repository = images_repository
         self.item_types_repository = item_types_repository
         self.items_repository = items_repository
         self.supply_sessions_repository = supply_sessions_repository
 
-    def get_current_session(self) -> SupplySession | None:
-        return self.supply_sessions_repository.get_current_session()
+    def get_current_session(self, with_joined_fields: bool = True) -> SupplySession | None:
+        return self.supply_sessions_repository.get_current_session(with_joined_fields)
 
     def start_session(self, item_type: ItemType, images: list[Image]) -> SupplySession:
         session = self.supply_sessions_repository.create(item_type=item_type)
-
-        for image in images:
-            self.items_repository.create(
-                session=session,
-                images=[image],
-                type=item_type,
-                price_category=item_type.price_category,
-                wrap_to=item_type.wrap_to,
-            )
-
+        self._create_items(session, item_type, images)
         return session
 
+    def _create_items(self, session: SupplySession, item_type: ItemType, images: list[Image]) -> list[Item]:
+        # Items added to a running session get the same defaults from its item type as the initial ones.
+        items = self.items_repository.create_many([
+            {
+                "session": session,
+                "type": item_type,
+                "price_category": item_type.price_category,
+                "wrap_to": item_type.wrap_to,
+            }
+            for _ in images
+        ])
+        self.images_repository.attach_to_items(items, images)
+        return items
+
     def process_item(self, item: Item) -> Item:
         if item.session is None:
             raise ItemProcessingFailed('Cannot process an already applied item')
 
         return self.parse_service.process_item(item)
 
-    def add_images(self, session: SupplySession, images: list[Image]) -> list[Item]:
-        items = []
+    def schedule_session_processing(self) -> SupplySession:
+        session = self.get_current_session(with_joined_fields=False)
+        now = datetime.now(timezone.utc)
+
+        if self.supply_sessions_repository.try_start_processing(
+            session.id,
+            now=now,
+            stale_before=now - self.processing_time_limit,
+        ):
+            self.schedule_service.after_commit(
+                self.supply_sessions_repository.session,
+                self.schedule_service.process_supply_session,
+                session.id,
+                on_failure=lambda session_, exception: self._release_unqueued_session(session_, session.id),
+            )
 
-        for image in images:
-            self.items_repository.create(session=session, images=[image], wrap_to=session.item_type.wrap_to)
+        return session
+
+    def _release_unqueued_session(self, session: Session, session_id: int) -> None:
+        SupplySessionsRepository(session, self.supply_sessions_repository.config).finish_processing(session_id)
+
+    def finish_session_processing(self, session_id: int) -> None:
+        self.supply_sessions_repository.finish_processing(session_id)
+
+    def process_session(
+        self,
+        session: SupplySession,
+        on_processed: Callable[[Item], None] | None = None,
+    ) -> list[Item]:
+        items = [item for item in session.items if item.parse_status == SupplyItemParseStatus.PENDING]
+        return self.parse_service.process_items(items, on_processed)
+
+    def get_session_progress(self, session: SupplySession) -> dict[str, int]:
+        counters = self.items_repository.count_by_parse_status(session.id)
 
-        session.total_items += len(items)
+        return {
+            "total": sum(counters.values()),
+            **{status.value: counters.get(status, 0) for status in SupplyItemParseStatus},
+        }
+
+    def add_images(self, session: SupplySession, images: list[Image]) -> list[Item]:
+        items = self._create_items(session, session.item_type, images)
         self.supply_sessions_repository.refresh(session)
         return items
 
@@ -80,26 +132,19 @@ class SupplyService:
         self.items_repository.delete([item_to_drop])
         return item_to_keep
 
-    def apply_session(self) -> list[Item]:
-        session = self.get_current_session()
-
-        items = session.items[:]
+    def apply_session(self) -> dict[str, int | list[int]]:
+        session = self.get_current_session(with_joined_fields=False)
 
-        for item in items:
-            if item.parse_status != SupplyItemParseStatus.SUCCESS:
-                raise SessionApplyFailed("Cannot apply a session with items not parsed successfully")
-
-            item.session = None
-            item.session_id = None
+        if self.items_repository.count_not_in_parse_status(session.id, SupplyItemParseStatus.SUCCESS):
+            raise SessionApplyFailed("Cannot apply a session with items not parsed successfully")
 
+        item_ids = self.items_repository.detach_from_session(session.id)
         self.supply_sessions_repository.delete([session])
-        return items
+        return {"id": session.id, "item_ids": item_ids}
 
     def discard_session(self) -> None:
-        session = self.get_current_session()
-
-        for item in session.items:
-            self.images_service.delete_for_item(item)
-            self.items_repository.delete([item])
+        session = self.get_current_session(with_joined_fields=False)
 
+        self.images_repository.delete_for_session(session.id)
+        self.items_repository.delete_for_session(session.id)
         self.supply_sessions_repository.delete([session])
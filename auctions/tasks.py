@@ -1,44 +1,76 @@
 import os
+from functools import wraps
+from typing import Callable
 
 import dramatiq
 import firebase_admin
 import loguru
 from argon2 import PasswordHasher
 from dramatiq.brokers.redis import RedisBroker
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session
-from sqlalchemy.orm.session import sessionmaker
+from redis import Redis
 
 from auctions.config import Config
-from auctions.db.models.auctions import Auction
 from auctions.db.models.auction_sets import AuctionSet
 from auctions.db.models.enum import PushEventType
+from auctions.db.models.items import Item
 from auctions.db.repositories.auction_sets import AuctionSetsRepository
 from auctions.db.repositories.auctions import AuctionsRepository
+from auctions.db.repositories.bids import BidsRepository
+from auctions.db.repositories.exports import ExportJobsRepository
+from auctions.db.repositories.images import ImagesRepository
+from auctions.db.repositories.invoices import InvoicesRepository
+from auctions.db.repositories.item_types import ItemTypesRepository
+from auctions.db.repositories.items import ItemsRepository
+from auctions.db.repositories.price_categories import PriceCategoriesRepository
 from auctions.db.repositories.push import PushSubscriptionsRepository
+from auctions.db.repositories.sessions import SupplySessionsRepository
+from auctions.db.repositories.upc_lookups import UpcLookupsRepository
 from auctions.db.repositories.users import UsersRepository
+from auctions.db.session import SessionManager
 from auctions.exceptions import ObjectDoesNotExist
 from auctions.services.auctions_service import AuctionsService
 from auctions.services.auth_service import AuthService
+from auctions.services.export_service import ExportService
+from auctions.services.images_service import ImagesService
+from auctions.services.parse_service import ParseService
 from auctions.services.password_service import PasswordService
 from auctions.services.push_service import PushService
 from auctions.services.schedule_service import ScheduleService
 from auctions.services.shop_connect_service import ShopConnectService
+from auctions.services.supply_service import SupplyService
 from auctions.utils.cipher import AESCipher
+from auctions.utils.counters import ItemCountersCache
+from auctions.utils.files import FileRemover
+from auctions.utils.price_categories import PriceCategoryIndex
+from auctions.utils.scraping import HostGuard
+from auctions.utils.scraping import ScrapingClient
 
 
 config = Config.load(os.getenv("CONFIG_PATH"))
-engine = create_engine(config.db_url, echo=False)
-session_class = scoped_session(sessionmaker(engine))
+session_manager = SessionManager(config, role="queue")
+session_class = session_manager.session
 
 broker = RedisBroker(url=config.broker_url)
 dramatiq.set_broker(broker)
 
 firebase_admin.initialize_app()
 
+redis = Redis.from_url(config.broker_url)
+file_remover = FileRemover(config, session_manager.session_factory)
+item_counters_cache = ItemCountersCache(redis, config)
+
 auctions_repository = AuctionsRepository(session=session_class, config=config)  # noqa
 auction_sets_repository = AuctionSetsRepository(session=session_class, config=config)  # noqa
+bids_repository = BidsRepository(session=session_class, config=config)  # noqa
+export_jobs_repository = ExportJobsRepository(session=session_class, config=config)  # noqa
+images_repository = ImagesRepository(session=session_class, config=config)  # noqa
+invoices_repository = InvoicesRepository(session=session_class, config=config)  # noqa
+item_types_repository = ItemTypesRepository(session=session_class, config=config)  # noqa
+items_repository = ItemsRepository(session=session_class, config=config)  # noqa
+price_categories_repository = PriceCategoriesRepository(session=session_class, config=config)  # noqa
 push_subscriptions_repository = PushSubscriptionsRepository(session=session_class, config=config)  # noqa
+supply_sessions_repository = SupplySessionsRepository(session=session_class, config=config)  # noqa
+upc_lookups_repository = UpcLookupsRepository(session=session_class, config=config)  # noqa
 users_repository = UsersRepository(session=session_class, config=config)  # noqa
 
 schedule_service = ScheduleService()
@@ -51,17 +83,49 @@ shop_connect_service = ShopConnectService(
     ),
     schedule_service=schedule_service,
     auctions_repository=auctions_repository,
+    invoices_repository=invoices_repository,
+    redis=redis,
     config=config,
 )
 
 auctions_service = AuctionsService(
     auction_sets_repository=auction_sets_repository,
     auctions_repository=auctions_repository,
+    items_repository=items_repository,
+    invoices_repository=invoices_repository,
     schedule_service=schedule_service,
     shop_connect_service=shop_connect_service,
     config=config,
 )
 
+images_service = ImagesService(images_repository=images_repository, redis=redis, config=config)
+
+supply_service = SupplyService(
+    images_service=images_service,
+    parse_service=ParseService(
+        images_service=images_service,
+        item_types_repository=item_types_repository,
+        price_categories_repository=price_categories_repository,
+        upc_lookups_repository=upc_lookups_repository,
+        scraping_client=ScrapingClient(config, guard=HostGuard(redis, config)),
+        price_category_index=PriceCategoryIndex(redis),
+        config=config,
+    ),
+    schedule_service=schedule_service,
+    images_repository=images_repository,
+    item_types_repository=item_types_repository,
+    items_repository=items_repository,
+    supply_sessions_repository=supply_sessions_repository,
+)
+
+export_service = ExportService(
+    schedule_service=schedule_service,
+    auction_sets_repository=auction_sets_repository,
+    auctions_repository=auctions_repository,
+    bids_repository=bids_repository,
+    export_jobs_repository=export_jobs_repository,
+    config=config,
+)
 
 auth_service = AuthService(shop_connect_service=shop_connect_service, users_repository=users_repository, config=config)
 push_service = PushService(
@@ -70,7 +134,23 @@ push_service = PushService(
 )
 
 
+def in_session(func: Callable) -> Callable:
+    @wraps(func)
+    def decorated(*args, **kwargs) -> None:
+        try:
+            func(*args, **kwargs)
+            session_class.commit()
+        except Exception:
+            session_class.rollback()
+            raise
+        finally:
+            session_class.remove()
+
+    return decorated
+
+
 @dramatiq.actor(max_retries=0)
+@in_session
 def try_close_auction_sets() -> None:
     auction_sets = auctions_service.auction_sets_repository.get_many(AuctionSet.ended_at.is_(None))
 
@@ -79,29 +159,66 @@ def try_close_auction_sets() -> None:
     for auction_set in auction_sets:
         auctions_service.close_auction_set(auction_set)
 
-    session_class.commit()
-    session_class.remove()
-
 
-@dramatiq.actor(max_retries=0)
+@dramatiq.actor(max_retries=3)
+@in_session
 def create_invoice(user_id: str, auction_ids: list[int]) -> None:
     loguru.logger.debug(f"Creating an invoice for user {user_id}")
     user = auth_service.get_user_by_id(user_id)
     auctions = auctions_repository.get_many(ids=auction_ids)
     shop_connect_service.create_invoice(user, auctions)
-    session_class.commit()
-    session_class.remove()
 
 
 @dramatiq.actor(max_retries=0)
+@in_session
 def check_invoices() -> None:
-    auctions = auctions_repository.get_many(Auction.invoice_link.is_not(None))
-    auctions_service.check_invoices(auctions)
-    session_class.commit()
-    session_class.remove()
+    auctions_service.check_invoices()
+
+
+@dramatiq.actor(max_retries=0, time_limit=60 * 60 * 1000)
+@in_session
+def process_supply_session(session_id: int) -> None:
+    processed_count = 0
+
+    def on_processed(item: Item) -> None:
+        nonlocal processed_count
+        processed_count += 1
+
+        if processed_count % config.supply_commit_batch_size == 0:
+            session_class.commit()
+
+    # Items stay loaded between batch commits instead of being reloaded one by one.
+    session_class().expire_on_commit = False
+
+    try:
+        session = supply_sessions_repository.get_one_by_id(session_id)
+        items = supply_service.process_session(session, on_processed=on_processed)
+        loguru.logger.debug(f"Processed {len(items)} items of supply session {session_id}")
+        session_class.commit()
+    finally:
+        # The processing flag has to be released even if parsing failed,
+        # so the reset is committed on its own instead of relying on in_session.
+        session_class.rollback()
+        supply_service.finish_session_processing(session_id)
+        session_class.commit()
+
+
+@dramatiq.actor(max_retries=0, time_limit=60 * 60 * 1000)
+@in_session
+def run_export_job(job_id: int) -> None:
+    job = export_jobs_repository.get_one_by_id(job_id)
+    job = export_service.run_job(job)
+    loguru.logger.debug(f"Export job {job_id} finished with status {job.status}")
+
+
+@dramatiq.actor(max_retries=0)
+@in_session
+def remove_expired_exports() -> None:
+    export_service.remove_expired_jobs()
 
 
 @dramatiq.actor(max_retries=0)
+@in_session
 def send_push(recipient_id: str, event_type: PushEventType, payload: ...) -> None:
     try:
         recipient = auth_service.get_user_by_id(recipient_id)
@@ -109,5 +226,3 @@ def send_push(recipient_id: str, event_type: PushEventType, payload: ...) -> Non
         return
 
     push_service.send_event(recipient, event_type, payload)
-    session_class.commit()
-    session_class.remove()
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+
+import pyvips
+from pyzbar.pyzbar import ZBarSymbol
+from pyzbar.pyzbar import decode
+
+BarcodeScanResult = tuple[str | None, str | None]
+
+
+@dataclass(frozen=True)
+class ScanPass:
+    width: int | None
+    rotation: str | None = None
+    bottom_half: bool = False
+
+
+SCAN_SYMBOLS = [ZBarSymbol.EAN13, ZBarSymbol.EAN5, ZBarSymbol.UPCA]
+
+SCAN_PASSES = (
+    ScanPass(width=1024),
+    ScanPass(width=2048),
+    ScanPass(width=1024, rotation="d90"),
+    ScanPass(width=1024, rotation="d270"),
+    ScanPass(width=None, bottom_half=True),
+    ScanPass(width=None),
+)
+
+
+def load_grayscale(path: str, width: int | None) -> pyvips.Image:
+    if width is None:
+        image = pyvips.Image.new_from_file(path)
+    else:
+        image = pyvips.Image.thumbnail(path, width, size="down")
+
+    return image.colourspace("b-w")[0].cast("uchar")
+
+
+def decode_frame(image: pyvips.Image) -> BarcodeScanResult:
+    codes = decode((image.write_to_memory(), image.width, image.height), symbols=SCAN_SYMBOLS)
+
+    upca = None
+    ean13 = None
+    ean5 = None
+
+    for code in codes:
+        if code.type == "UPCA":
+            upca = code.data.decode("utf-8")
+        elif code.type == "EAN13":
+            ean13 = code.data.decode("utf-8")
+        elif code.type == "EAN5":
+            ean5 = code.data.decode("utf-8")
+
+    return upca or ean13, ean5
+
+
+def scan_barcode(path: str) -> BarcodeScanResult:
+    frames: dict[int | None, pyvips.Image] = {}
+    upc = None
+    upc5 = None
+    passes_left = len(SCAN_PASSES)
+
+    for scan_pass in SCAN_PASSES:
+        if passes_left == 0:
+            break
+
+        passes_left -= 1
+
+        if scan_pass.width not in frames:
+            frames[scan_pass.width] = load_grayscale(path, scan_pass.width)
+
+        frame = frames[scan_pass.width]
+
+        if scan_pass.rotation is not None:
+            frame = frame.rot(scan_pass.rotation)
+
+        if scan_pass.bottom_half:
+            frame = frame.crop(0, frame.height // 2, frame.width, frame.height - frame.height // 2)
+
+        frame_upc, frame_upc5 = decode_frame(frame)
+        upc = upc or frame_upc
+        upc5 = upc5 or frame_upc5
+
+        if upc is not None:
+            if upc5 is not None:
+                break
+
+            # Most covers have no EAN-5 add-on, so it gets one more pass at most.
+            passes_left = min(passes_left, 1)
+
+    return upc, upc5
@@ -0,0 +1,85 @@
+import json
+
+import loguru
+from redis import Redis
+from redis import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState
+from sqlalchemy.orm import Session
+
+from auctions.config import Config
+from auctions.db.models.auctions import Auction
+from auctions.db.models.item_types import ItemType
+from auctions.db.models.items import Item
+from auctions.db.models.price_categories import PriceCategory
+
+CounterRow = tuple[int, int, int]
+
+
+class ItemCountersCache:
+    key = "items:counters"
+    changed_key = "item_counters_changed"
+    # Types and categories are tracked too, so their deletion drops counters that still reference them.
+    tracked_models = (Item, Auction, ItemType, PriceCategory)
+
+    def __init__(self, redis: Redis, config: Config) -> None:
+        self.redis = redis
+        self.ttl_ms = config.item_counters_cache_ttl_ms
+
+        if self.ttl_ms:
+            event.listen(Session, "after_flush", self._on_flush)
+            event.listen(Session, "do_orm_execute", self._on_orm_execute)
+            event.listen(Session, "after_commit", self._on_commit)
+            event.listen(Session, "after_rollback", self._on_rollback)
+
+    def get(self) -> list[CounterRow] | None:
+        if not self.ttl_ms:
+            return None
+
+        try:
+            cached = self.redis.get(self.key)
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not read item counters from cache: {exception}")
+            return None
+
+        if cached is None:
+            return None
+
+        return [tuple(row) for row in json.loads(cached)]
+
+    def set(self, rows: list[CounterRow]) -> None:
+        if not self.ttl_ms:
+            return
+
+        try:
+            self.redis.set(self.key, json.dumps(rows), px=self.ttl_ms)
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not store item counters in cache: {exception}")
+
+    def invalidate(self) -> None:
+        try:
+            self.redis.delete(self.key)
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not invalidate item counters cache: {exception}")
+
+    def _on_flush(self, session: Session, flush_context) -> None:
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(instance, self.tracked_models):
+                session.info[self.changed_key] = True
+                return
+
+    def _on_orm_execute(self, orm_execute_state: ORMExecuteState) -> None:
+        if orm_execute_state.is_select:
+            return
+
+        mapper = orm_execute_state.bind_mapper
+
+        if mapper is not None and issubclass(mapper.class_, self.tracked_models):
+            orm_execute_state.session.info[self.changed_key] = True
+
+    def _on_commit(self, session: Session) -> None:
+        if session.info.pop(self.changed_key, False):
+            self.invalidate()
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop(self.changed_key, None)
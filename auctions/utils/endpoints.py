@@ -2,12 +2,17 @@ from functools import wraps
 from typing import cast
 from typing import Callable
 
+from flask import Response
 from flask import current_app
+from flask import request
 from sqlalchemy.orm.session import Session
 
+from auctions.config import Config
 from auctions.db.session import SessionManager
 from auctions.services.auth_service import AuthService
 from auctions.utils.app import Flask
+from auctions.utils.metrics import RequestMetrics
+from auctions.utils.metrics import RequestTimer
 
 
 current_app = cast(Flask, current_app)
@@ -18,30 +23,69 @@ def endpoint(
     protected: bool = True,
     is_admin: bool = True,
     inject_user: bool = False,
+    read_only: bool = False,
 ) -> Callable:
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         @endpoint_spec
         def decorated(*args, **kwargs) -> ...:
+            request_metrics: RequestMetrics = current_app.provider.provide(RequestMetrics)
+
+            with request_metrics.track() as timer:
+                status_code = 500
+
+                try:
+                    result = handle(timer, *args, **kwargs)
+                    status_code = result.status_code if isinstance(result, Response) else 200
+                except Exception as exception:
+                    status_code = getattr(exception, "status_code", None) or getattr(exception, "code", None) or 500
+                    raise
+                finally:
+                    request_metrics.record(request.endpoint, status_code, timer)
+
+            if isinstance(result, Response) and current_app.provider.provide(Config).debug:
+                result.headers["Server-Timing"] = timer.get_server_timing()
+
+            return result
+
+        def handle(timer: RequestTimer, *args, **kwargs) -> ...:
             session_qual_name = current_app.provider.get_qual_name(Session)
             session_manager: SessionManager = current_app.provider.provide(SessionManager)
+            user = None
 
             if protected:
-                auth_service = current_app.provider.provide(
-                    AuthService,
-                    {session_qual_name: session_manager.session},
-                )
-                user = auth_service.authorize_request(is_admin)
+                with timer.measure("auth"):
+                    auth_service = current_app.provider.provide(
+                        AuthService,
+                        {session_qual_name: session_manager.session},
+                    )
+                    user = auth_service.authorize_request(is_admin)
 
                 if inject_user:
                     kwargs["user"] = user
 
+            user_id = user.id if user is not None else None
+
+            if read_only:
+                session_manager.route_read_only(user_id)
+            else:
+                session_manager.track_writes(user_id)
+
+            @wraps(func)
+            def handler(*handler_args, **handler_kwargs) -> ...:
+                with timer.measure("handler"):
+                    return func(*handler_args, **handler_kwargs)
+
             try:
-                result = current_app.provider.inject(
-                    func,
-                    {session_qual_name: session_manager.session},
-                )(*args, **kwargs)
-                session_manager.session.commit()
+                with timer.measure("inject"):
+                    result = current_app.provider.inject(
+                        handler,
+                        {session_qual_name: session_manager.session},
+                    )(*args, **kwargs)
+
+                with timer.measure("commit"):
+                    session_manager.session.commit()
+
                 return result
             finally:
                 session_manager.session.remove()
@@ -0,0 +1,40 @@
+import csv
+from io import TextIOWrapper
+from typing import BinaryIO
+from typing import Callable
+from typing import Iterable
+
+from openpyxl import Workbook
+
+from auctions.db.models.enum import ExportFormat
+
+
+def write_xlsx(file: BinaryIO, header: list[str], rows: Iterable[list[...]]) -> None:
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    worksheet.append(header)
+
+    for row in rows:
+        worksheet.append(row)
+
+    workbook.save(file)
+
+
+def write_csv(file: BinaryIO, header: list[str], rows: Iterable[list[...]]) -> None:
+    text_file = TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text_file)
+    writer.writerow(header)
+    writer.writerows(rows)
+    text_file.flush()
+    text_file.detach()
+
+
+writers: dict[ExportFormat, Callable[[BinaryIO, list[str], Iterable[list[...]]], None]] = {
+    ExportFormat.XLSX: write_xlsx,
+    ExportFormat.CSV: write_csv,
+}
+
+content_types: dict[ExportFormat, str] = {
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.CSV: "text/csv",
+}
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+from uuid import uuid4
+
+import loguru
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import sessionmaker
+
+from auctions.config import Config
+
+
+@contextmanager
+def replace_atomically(target_path: Path) -> Iterator[Path]:
+    temp_path = target_path.with_name(f".{uuid4().hex}.{target_path.name}")
+
+    try:
+        yield temp_path
+        os.replace(temp_path, target_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+class FileRemover:
+    pending_key = "pending_file_removals"
+
+    def __init__(self, config: Config, session_factory: sessionmaker) -> None:
+        self.session_factory = session_factory
+        self.executor = ThreadPoolExecutor(max_workers=config.file_removal_workers, thread_name_prefix="file-removal")
+
+        event.listen(Session, "after_commit", self._on_commit)
+        event.listen(Session, "after_rollback", self._on_rollback)
+
+    @classmethod
+    def schedule(
+        cls,
+        session: Session,
+        paths: list[str],
+        is_referenced: Callable[[Session], bool] | None = None,
+    ) -> None:
+        if paths:
+            session.info.setdefault(cls.pending_key, []).append((paths, is_referenced))
+
+    def _on_commit(self, session: Session) -> None:
+        removals = session.info.pop(self.pending_key, None)
+
+        if removals:
+            self.executor.submit(self.remove_unreferenced, removals)
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop(self.pending_key, None)
+
+    def remove_unreferenced(self, removals: list[tuple[list[str], Callable[[Session], bool] | None]]) -> None:
+        for paths, is_referenced in removals:
+            if is_referenced is None:
+                self.remove(paths)
+                continue
+
+            # The check and the unlink share one transaction, so the lock that
+            # is_referenced takes also keeps concurrent uploads of the file out.
+            try:
+                with self.session_factory() as session, session.begin():
+                    if not is_referenced(session):
+                        self.remove(paths)
+            except SQLAlchemyError as exception:
+                loguru.logger.warning(f"Could not check references of {paths}, keeping them: {exception}")
+
+    @staticmethod
+    def remove(paths: list[str]) -> None:
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as exception:
+                loguru.logger.warning(f"Could not remove {path}: {exception}")
@@ -0,0 +1,13 @@
+from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+
+try:
+    import lxml  # noqa
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+else:
+    DEFAULT_PARSER = "lxml"
+
+
+def parse_html(markup: str, parse_only: SoupStrainer | None = None, parser: str = DEFAULT_PARSER) -> BeautifulSoup:
+    return BeautifulSoup(markup, parser, parse_only=parse_only)
@@ -1,9 +1,12 @@
-import json
 from base64 import b64encode
+from datetime import datetime
+from time import sleep
 
 import loguru
 import requests
 
+from auctions.utils.rate_limit import TokenBucket
+
 
 class InsalesApi:
     class RequestFailedError(Exception):
@@ -12,8 +15,24 @@ class InsalesApi:
             self.error = error
             self.status_code = status_code
 
-    def __init__(self, account: str, api_key: str, api_secret: str) -> None:
+    retry_status_codes = (429, 503)
+    # A 503 may come back after InSales has already applied a write, so non-idempotent
+    # requests are only retried when they were rejected by the rate limit.
+    non_idempotent_retry_status_codes = (429,)
+    idempotent_methods = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    orders_page_size = 100
+
+    def __init__(
+        self,
+        account: str,
+        api_key: str,
+        api_secret: str,
+        rate_limiter: TokenBucket | None = None,
+        retries: int = 0,
+    ) -> None:
         self.account = account
+        self.rate_limiter = rate_limiter
+        self.retries = retries
 
         auth = b64encode(f"{api_key}:{api_secret}".encode("utf-8")).decode("utf-8")
 
@@ -28,17 +47,47 @@ class InsalesApi:
         url = url.removeprefix("/")
         return f"https://{self.account}.myinsales.ru/{url}"
 
-    def request(self, method: str, url: str, data: dict[str, ...] = None) -> ...:
+    def request(self, method: str, url: str, data: dict[str, ...] = None, params: dict[str, ...] = None) -> ...:
         loguru.logger.debug(f"Sending request to {url}")
         loguru.logger.debug(f"Request body: {data}")
         full_url = self._build_full_url(url)
-        response = self.session.request(method=method, url=full_url, headers=self.headers, json=data)
+
+        if method.upper() in self.idempotent_methods:
+            retry_status_codes = self.retry_status_codes
+        else:
+            retry_status_codes = self.non_idempotent_retry_status_codes
+
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            response = self.session.request(
+                method=method,
+                url=full_url,
+                headers=self.headers,
+                json=data,
+                params=params,
+            )
+
+            if response.status_code not in retry_status_codes or attempt == self.retries:
+                break
+
+            retry_after = self._get_retry_after(response, attempt)
+            loguru.logger.warning(f"InSales responded with {response.status_code}, retrying in {retry_after} s")
+            sleep(retry_after)
 
         if response.status_code >= 400:
             raise self.RequestFailedError(response.text, response.status_code)
 
         return response.json()
 
+    @staticmethod
+    def _get_retry_after(response: requests.Response, attempt: int) -> float:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return float(2 ** attempt)
+
     def get_client(self, client_id: int) -> dict[str, ...]:
         return self.request("GET", f"/admin/clients/{client_id}.json")
 
@@ -63,6 +112,27 @@ class InsalesApi:
     def get_order(self, order_id: int) -> dict[str, ...]:
         return self.request("GET", f"/admin/orders/{order_id}.json")
 
+    def list_orders(self, updated_since: datetime) -> list[dict[str, ...]]:
+        orders = []
+        page = 1
+
+        while True:
+            orders_page = self.request(
+                "GET",
+                "/admin/orders.json",
+                params={
+                    "updated_since": updated_since.isoformat(),
+                    "per_page": self.orders_page_size,
+                    "page": page,
+                },
+            )
+            orders.extend(orders_page)
+
+            if len(orders_page) < self.orders_page_size:
+                return orders
+
+            page += 1
+
     def create_order(
         self,
         product_ids: list[int],
@@ -0,0 +1,184 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextlib import nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import ContextManager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestTimer:
+    sql_phase = "sql"
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = defaultdict(float)
+        self.sql_statements = 0
+
+        self._stack: list[str] = []
+        self._started_at = perf_counter()
+        self._switched_at = self._started_at
+
+    @property
+    def total(self) -> float:
+        return perf_counter() - self._started_at
+
+    def _switch(self) -> None:
+        now = perf_counter()
+
+        if self._stack:
+            self.durations[self._stack[-1]] += now - self._switched_at
+
+        self._switched_at = now
+
+    def enter(self, phase: str) -> None:
+        self._switch()
+        self._stack.append(phase)
+
+    def exit(self, phase: str) -> None:
+        if not self._stack or self._stack[-1] != phase:
+            return
+
+        self._switch()
+        self._stack.pop()
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        self.enter(phase)
+
+        try:
+            yield
+        finally:
+            self.exit(phase)
+
+    def get_server_timing(self) -> str:
+        entries = [
+            f"{phase};dur={seconds * 1000:.2f}"
+            + (f';desc="{self.sql_statements} statements"' if phase == self.sql_phase else "")
+            for phase, seconds in self.durations.items()
+        ]
+        entries.append(f"total;dur={self.total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+current_timer: ContextVar[RequestTimer | None] = ContextVar("current_timer", default=None)
+
+
+def measure(phase: str) -> ContextManager[None]:
+    timer = current_timer.get()
+    return nullcontext() if timer is None else timer.measure(phase)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+class RequestMetrics:
+    duration_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._requests: dict[tuple[str, int], int] = defaultdict(int)
+        self._duration_buckets: dict[str, list[int]] = {}
+        self._duration_sums: dict[str, float] = defaultdict(float)
+        self._phase_sums: dict[tuple[str, str], float] = defaultdict(float)
+        self._sql_statements: dict[str, int] = defaultdict(int)
+
+        event.listen(Engine, "before_cursor_execute", self._on_before_execute)
+        event.listen(Engine, "after_cursor_execute", self._on_after_execute)
+        event.listen(Engine, "handle_error", self._on_error)
+
+    @staticmethod
+    def _on_before_execute(*args) -> None:
+        timer = current_timer.get()
+
+        if timer is not None:
+            timer.sql_statements += 1
+            timer.enter(RequestTimer.sql_phase)
+
+    @staticmethod
+    def _on_after_execute(*args) -> None:
+        timer = current_timer.get()
+
+        if timer is not None:
+            timer.exit(RequestTimer.sql_phase)
+
+    @staticmethod
+    def _on_error(exception_context) -> None:
+        timer = current_timer.get()
+
+        if timer is not None:
+            timer.exit(RequestTimer.sql_phase)
+
+    @contextmanager
+    def track(self) -> Iterator[RequestTimer]:
+        timer = RequestTimer()
+        token = current_timer.set(timer)
+
+        try:
+            yield timer
+        finally:
+            current_timer.reset(token)
+
+    def record(self, endpoint_name: str, status_code: int, timer: RequestTimer) -> None:
+        total = timer.total
+
+        with self._lock:
+            self._requests[(endpoint_name, status_code)] += 1
+            self._duration_sums[endpoint_name] += total
+            self._sql_statements[endpoint_name] += timer.sql_statements
+
+            buckets = self._duration_buckets.setdefault(endpoint_name, [0] * (len(self.duration_buckets) + 1))
+
+            for index, bound in enumerate(self.duration_buckets):
+                if total <= bound:
+                    buckets[index] += 1
+
+            buckets[-1] += 1
+
+            for phase, seconds in timer.durations.items():
+                self._phase_sums[(endpoint_name, phase)] += seconds
+
+    def render(self) -> str:
+        lines = []
+
+        with self._lock:
+            lines.append("# HELP auctions_requests_total Handled requests by endpoint and status code.")
+            lines.append("# TYPE auctions_requests_total counter")
+
+            for (endpoint_name, status_code), count in self._requests.items():
+                labels = format_labels({"endpoint": endpoint_name, "status": str(status_code)})
+                lines.append(f"auctions_requests_total{{{labels}}} {count}")
+
+            lines.append("# HELP auctions_request_duration_seconds Request duration by endpoint.")
+            lines.append("# TYPE auctions_request_duration_seconds histogram")
+
+            for endpoint_name, buckets in self._duration_buckets.items():
+                for bound, count in zip((*self.duration_buckets, "+Inf"), buckets):
+                    labels = format_labels({"endpoint": endpoint_name, "le": str(bound)})
+                    lines.append(f"auctions_request_duration_seconds_bucket{{{labels}}} {count}")
+
+                labels = format_labels({"endpoint": endpoint_name})
+                lines.append(f"auctions_request_duration_seconds_sum{{{labels}}} {self._duration_sums[endpoint_name]}")
+                lines.append(f"auctions_request_duration_seconds_count{{{labels}}} {buckets[-1]}")
+
+            lines.append(
+                "# HELP auctions_request_phase_seconds_total Exclusive time spent in each request phase by endpoint."
+            )
+            lines.append("# TYPE auctions_request_phase_seconds_total counter")
+
+            for (endpoint_name, phase), seconds in self._phase_sums.items():
+                labels = format_labels({"endpoint": endpoint_name, "phase": phase})
+                lines.append(f"auctions_request_phase_seconds_total{{{labels}}} {seconds}")
+
+            lines.append("# HELP auctions_sql_statements_total SQL statements executed by endpoint.")
+            lines.append("# TYPE auctions_sql_statements_total counter")
+
+            for endpoint_name, count in self._sql_statements.items():
+                labels = format_labels({"endpoint": endpoint_name})
+                lines.append(f"auctions_sql_statements_total{{{labels}}} {count}")
+
+        return "\n".join(lines) + "\n"
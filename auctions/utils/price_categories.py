@@ -0,0 +1,85 @@
+from threading import Lock
+
+import loguru
+from redis import Redis
+from redis import RedisError
+from sqlalchemy import event
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import make_transient_to_detached
+
+from auctions.db.models.price_categories import PriceCategory
+from auctions.db.repositories.price_categories import PriceCategoriesRepository
+
+PriceKey = tuple[float, int]
+
+
+def get_price_key(usd: float, rub: int) -> PriceKey:
+    return round(float(usd), 2), int(rub)
+
+
+class PriceCategoryIndex:
+    version_key = "price_categories:version"
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+        self._lock = Lock()
+        self._version: bytes | None = None
+        self._categories: dict[PriceKey, dict[str, ...]] | None = None
+
+        event.listen(Session, "after_commit", self._on_commit)
+        event.listen(Session, "after_rollback", self._on_rollback)
+
+    def _on_commit(self, session: Session) -> None:
+        if session.info.pop(PriceCategoriesRepository.changed_key, False):
+            self.invalidate()
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop(PriceCategoriesRepository.changed_key, None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._categories = None
+
+        try:
+            self.redis.incr(self.version_key)
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not publish price categories invalidation: {exception}")
+
+    def refresh(self) -> None:
+        try:
+            version = self.redis.get(self.version_key)
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not check price categories version: {exception}")
+            return
+
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._categories = None
+
+    def get(self, repository: PriceCategoriesRepository, usd: float, rub: int) -> PriceCategory | None:
+        with self._lock:
+            if self._categories is None:
+                self._categories = self._load(repository)
+
+            values = self._categories.get(get_price_key(usd, rub))
+
+        if values is None:
+            return None
+
+        instance = PriceCategory(**values)
+        make_transient_to_detached(instance)
+        return repository.session.merge(instance, load=False)
+
+    @staticmethod
+    def _load(repository: PriceCategoriesRepository) -> dict[PriceKey, dict[str, ...]]:
+        columns = [column.key for column in inspect(PriceCategory).column_attrs]
+        categories = {}
+
+        for price_category in repository.get_many(with_pagination=False, with_joined_fields=False):
+            key = get_price_key(price_category.usd, price_category.rub)
+            categories.setdefault(key, {column: getattr(price_category, column) for column in columns})
+
+        return categories
@@ -0,0 +1,50 @@
+from time import sleep
+
+import loguru
+from redis import Redis
+from redis import RedisError
+
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+local wait = 0
+
+tokens = math.min(capacity, tokens + (now - updated_at) * rate / 1000)
+
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class TokenBucket:
+    def __init__(self, redis: Redis, key: str, rate: float, capacity: int) -> None:
+        self.redis = redis
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def acquire(self) -> None:
+        while True:
+            try:
+                wait_ms = self.script(keys=[self.key], args=[self.rate, self.capacity])
+            except RedisError as exception:
+                loguru.logger.warning(f"Could not acquire a token from {self.key}: {exception}")
+                return
+
+            if not wait_ms:
+                return
+
+            sleep(wait_ms / 1000)
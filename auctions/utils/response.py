@@ -3,6 +3,8 @@ from datetime import datetime
 
 from flask import Response
 
+from auctions.utils.metrics import measure
+
 
 def serialize_datetime(obj) -> str:
     if isinstance(obj, datetime):
@@ -11,8 +13,11 @@ def serialize_datetime(obj) -> str:
 
 class JsonResponse(Response):
     def __init__(self, data: ..., **kwargs) -> None:
+        with measure("serialize"):
+            content = json.dumps(data, default=serialize_datetime)
+
         super().__init__(
-            json.dumps(data, default=serialize_datetime),
+            content,
             mimetype="application/json",
             content_type="application/json",
             **kwargs,
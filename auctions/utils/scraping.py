@@ -0,0 +1,231 @@
+import json
+from collections import defaultdict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from hashlib import blake2b
+from pathlib import Path
+from threading import BoundedSemaphore
+from threading import Lock
+from time import monotonic
+from time import sleep
+from typing import Iterator
+from urllib.parse import urlsplit
+
+import loguru
+import requests
+from redis import Redis
+from redis import RedisError
+from requests.adapters import BaseAdapter
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from auctions.config import Config
+from auctions.utils.rate_limit import TokenBucket
+
+
+class HostUnavailableError(requests.ConnectionError):
+    def __init__(self, host: str, reason: str) -> None:
+        super().__init__(f"{host} is unavailable: {reason}")
+        self.host = host
+        self.reason = reason
+
+
+class HostThrottle:
+    def __init__(self, concurrency: int, interval: float) -> None:
+        self.concurrency = concurrency
+        self.interval = interval
+
+        self._lock = Lock()
+        self._semaphores: dict[str, BoundedSemaphore] = {}
+        self._next_request_at: dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def acquire(self, url: str) -> Iterator[None]:
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, BoundedSemaphore(self.concurrency))
+
+        with semaphore:
+            with self._lock:
+                now = monotonic()
+                request_at = max(now, self._next_request_at[host])
+                self._next_request_at[host] = request_at + self.interval
+
+            if request_at > now:
+                sleep(request_at - now)
+
+            yield
+
+
+class HostGuard:
+    key_prefix = "scraping"
+
+    def __init__(self, redis: Redis, config: Config) -> None:
+        self.redis = redis
+        self.config = config
+
+    def check(self, host: str) -> None:
+        try:
+            reason = self.redis.get(f"{self.key_prefix}:open:{host}")
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not check circuit state for {host}: {exception}")
+            return
+
+        if reason is not None:
+            raise HostUnavailableError(host, reason.decode("utf-8"))
+
+    def acquire(self, host: str) -> None:
+        if not self.config.scrape_host_interval_ms:
+            return
+
+        TokenBucket(
+            self.redis,
+            f"{self.key_prefix}:bucket:{host}",
+            rate=1000 / self.config.scrape_host_interval_ms,
+            capacity=self.config.scrape_host_concurrency,
+        ).acquire()
+
+    def record_success(self, host: str) -> None:
+        try:
+            self.redis.delete(f"{self.key_prefix}:failures:{host}")
+        except RedisError:
+            pass
+
+    def record_failure(self, host: str, reason: str) -> None:
+        failures_key = f"{self.key_prefix}:failures:{host}"
+
+        try:
+            with self.redis.pipeline() as pipeline:
+                pipeline.incr(failures_key)
+                pipeline.pexpire(failures_key, self.config.scrape_failure_window_ms)
+                failures, _ = pipeline.execute()
+
+            if failures >= self.config.scrape_failure_threshold:
+                loguru.logger.warning(f"Opening circuit for {host} after {failures} failures: {reason}")
+                self.redis.set(f"{self.key_prefix}:open:{host}", reason, px=self.config.scrape_circuit_cooldown_ms)
+                self.redis.delete(failures_key)
+        except RedisError as exception:
+            loguru.logger.warning(f"Could not record a failure for {host}: {exception}")
+
+
+class RecordingAdapter(BaseAdapter):
+    def __init__(self, responses_path: Path, adapter: BaseAdapter) -> None:
+        super().__init__()
+        self.responses_path = responses_path
+        self.adapter = adapter
+
+        self.responses_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_record_name(url: str) -> str:
+        return f"{blake2b(url.encode('utf-8'), digest_size=16).hexdigest()}.json"
+
+    def send(self, request: PreparedRequest, **kwargs) -> requests.Response:
+        response = self.adapter.send(request, **kwargs)
+
+        record = {
+            "url": request.url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "body": response.text,
+        }
+
+        record_path = self.responses_path / self.get_record_name(request.url)
+        record_path.write_text(json.dumps(record), encoding="utf-8")
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, responses_path: Path, latency_ms: int = 0) -> None:
+        super().__init__()
+        self.responses_path = responses_path
+        self.latency_ms = latency_ms
+
+    def send(self, request: PreparedRequest, **kwargs) -> requests.Response:
+        record_path = self.responses_path / RecordingAdapter.get_record_name(request.url)
+
+        if not record_path.exists():
+            raise requests.ConnectionError(f"No recorded response for {request.url}", request=request)
+
+        if self.latency_ms:
+            sleep(self.latency_ms / 1000)
+
+        record = json.loads(record_path.read_text(encoding="utf-8"))
+
+        response = requests.Response()
+        response.status_code = record["status_code"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response.headers.pop("Content-Encoding", None)
+        response._content = record["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class ScrapingClient:
+    def __init__(self, config: Config, adapter: BaseAdapter | None = None, guard: HostGuard | None = None) -> None:
+        self.config = config
+        self.guard = guard
+        self.timeout = (config.scrape_connect_timeout_ms / 1000, config.scrape_read_timeout_ms / 1000)
+        self.throttle = HostThrottle(
+            config.scrape_host_concurrency,
+            0 if guard is not None else config.scrape_host_interval_ms / 1000,
+        )
+        self.executor = ThreadPoolExecutor(max_workers=config.scrape_workers, thread_name_prefix="scraping")
+
+        if adapter is None:
+            adapter = self.create_adapter(config)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @staticmethod
+    def create_adapter(config: Config) -> HTTPAdapter:
+        return HTTPAdapter(
+            pool_maxsize=config.scrape_host_concurrency,
+            max_retries=Retry(
+                total=config.scrape_retries,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+            ),
+        )
+
+    def get(self, url: str) -> requests.Response:
+        if self.guard is None:
+            with self.throttle.acquire(url):
+                return self.session.get(url, timeout=self.timeout)
+
+        host = urlsplit(url).netloc
+        self.guard.check(host)
+
+        with self.throttle.acquire(url):
+            self.guard.acquire(host)
+
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException as exception:
+                self.guard.record_failure(host, exception.__class__.__name__)
+                raise
+
+        if response.status_code == 429 or response.status_code >= 500:
+            self.guard.record_failure(host, f"HTTP {response.status_code}")
+        else:
+            self.guard.record_success(host)
+
+        return response
+
+    def submit(self, url: str) -> Future[requests.Response]:
+        return self.executor.submit(self.get, url)
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from bs4 import SoupStrainer
+
+from auctions.services.parse_service import BARCODE_PAGE_STRAINER
+from auctions.services.parse_service import CONDITION_PRICES_STRAINER
+from auctions.services.parse_service import COVER_GALLERY_STRAINER
+from auctions.utils.html import parse_html
+
+
+# Pages are matched to a parser by file name prefix (see page_kinds). To record a live page, save it as is:
+#   curl -o fixtures/pages/barcode_<upc>.html https://www.comics.org/barcode/<upc>/
+#   curl -o fixtures/pages/issue_<id>.html https://www.comics.org/issue/<id>/
+#   cover_gallery_*.html - the page linked from ".issue_cover_links .right a" on an issue page
+#   mycomicshop_*.html - https://www.mycomicshop.com/search?q=<series>+%23<issue>&minyr=<year>&maxyr=<year>
+fixtures_path = Path("fixtures/pages")
+repeat = 20
+
+page_kinds: dict[str, tuple[SoupStrainer | None, str]] = {
+    "barcode": (BARCODE_PAGE_STRAINER, "table.listing tr"),
+    "issue": (None, "#series_and_issue"),
+    "cover_gallery": (COVER_GALLERY_STRAINER, ".cover_number"),
+    "mycomicshop": (CONDITION_PRICES_STRAINER, "#resultstab .issue"),
+}
+
+backends: dict[str, tuple[str, bool]] = {
+    "html.parser": ("html.parser", False),
+    "lxml": ("lxml", False),
+    "lxml+strainer": ("lxml", True),
+}
+
+
+def measure(markup: str, parser: str, parse_only: SoupStrainer | None, selector: str) -> tuple[float, int]:
+    started_at = perf_counter()
+
+    for _ in range(repeat):
+        matches = parse_html(markup, parse_only, parser).select(selector)
+
+    return (perf_counter() - started_at) / repeat * 1000, len(matches)
+
+
+def execute() -> None:
+    pages_path = Path(sys.argv[1]) if len(sys.argv) > 1 else fixtures_path
+
+    print(f"{'fixture':<40} {'backend':<16} {'ms/page':>10} {'matches':>8}")
+
+    for fixture in sorted(pages_path.glob("*.html")):
+        kind = next((kind for kind in page_kinds if fixture.stem.startswith(kind)), None)
+
+        if kind is None:
+            continue
+
+        strainer, selector = page_kinds[kind]
+        markup = fixture.read_text(encoding="utf-8")
+
+        for backend, (parser, use_strainer) in backends.items():
+            if use_strainer and strainer is None:
+                continue
+
+            elapsed, matches = measure(markup, parser, strainer if use_strainer else None, selector)
+            print(f"{fixture.name:<40} {backend:<16} {elapsed:>10.2f} {matches:>8}")
+
+
+if __name__ == "__main__":
+    execute()
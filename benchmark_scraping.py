@@ -0,0 +1,165 @@
+import json
+import os
+import re
+import tracemalloc
+from argparse import ArgumentParser
+from argparse import Namespace
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import wraps
+from itertools import cycle
+from itertools import islice
+from pathlib import Path
+from statistics import mean
+from statistics import quantiles
+from time import perf_counter
+from typing import Callable
+
+from auctions.config import Config
+from auctions.services.parse_service import ParseService
+from auctions.utils.scraping import RecordingAdapter
+from auctions.utils.scraping import ReplayAdapter
+from auctions.utils.scraping import ScrapingClient
+
+
+# fixtures/responses ships one recorded session (a barcode lookup through the issue page, the cover gallery
+# and the mycomicshop prices), so the benchmark replays out of the box. To record more UPCs from live pages:
+#   python benchmark_scraping.py --record --upcs upcs.txt
+# Every fetched URL is stored as <blake2b(url)>.json next to the existing records, and later runs without
+# --record pick up the recorded barcode pages as their UPC list.
+stages = (
+    "_fetch_barcode_data",
+    "_parse_item_variant_from_cover_gallery",
+    "_parse_item_condition_prices",
+)
+
+
+class StageRecorder:
+    def __init__(self, trace_allocations: bool) -> None:
+        self.trace_allocations = trace_allocations
+        self.timings: dict[str, list[float]] = defaultdict(list)
+        self.allocations: dict[str, list[int]] = defaultdict(list)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        @wraps(func)
+        def decorated(*args, **kwargs) -> ...:
+            allocated_before = tracemalloc.get_traced_memory()[0] if self.trace_allocations else 0
+            started_at = perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.timings[name].append(perf_counter() - started_at)
+
+                if self.trace_allocations:
+                    self.allocations[name].append(tracemalloc.get_traced_memory()[0] - allocated_before)
+
+        return decorated
+
+    def report(self) -> None:
+        print(f"{'stage':<42} {'calls':>6} {'mean ms':>9} {'p95 ms':>9} {'KiB/call':>9}")
+
+        for name in stages:
+            timings = self.timings.get(name)
+
+            if not timings:
+                continue
+
+            p95 = quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+            allocated = mean(self.allocations[name]) / 1024 if self.allocations.get(name) else 0
+            print(f"{name:<42} {len(timings):>6} {mean(timings) * 1000:>9.2f} {p95 * 1000:>9.2f} {allocated:>9.1f}")
+
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description="Benchmark ParseService extractors over recorded responses")
+    parser.add_argument("--responses", type=Path, default=Path("fixtures/responses"))
+    parser.add_argument("--upcs", type=Path, help="File with one full UPC (upca + upc5) per line")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Simulated latency of replayed responses")
+    parser.add_argument("--record", action="store_true", help="Fetch live pages and record them")
+    parser.add_argument("--no-allocations", action="store_true")
+    return parser.parse_args()
+
+
+def load_upcs(args: Namespace) -> list[str]:
+    if args.upcs is not None:
+        return [line.strip() for line in args.upcs.read_text().splitlines() if line.strip()]
+
+    upcs = []
+
+    for record_path in sorted(args.responses.glob("*.json")):
+        url = json.loads(record_path.read_text(encoding="utf-8"))["url"]
+        barcode = re.search(r"comics\.org/barcode/(\d+)/", url)
+
+        if barcode is not None:
+            upcs.append(barcode.groups()[0])
+
+    return upcs
+
+
+def execute() -> None:
+    args = parse_args()
+    config = Config.load(os.getenv("CONFIG_PATH", "config/config.yml"))
+
+    if args.record:
+        adapter = RecordingAdapter(args.responses, ScrapingClient.create_adapter(config))
+    else:
+        config = replace(config, scrape_host_interval_ms=0, scrape_retries=0)
+        adapter = ReplayAdapter(args.responses, args.latency_ms)
+
+    parse_service = ParseService(
+        images_service=None,
+        item_types_repository=None,
+        price_categories_repository=None,
+        upc_lookups_repository=None,
+        scraping_client=ScrapingClient(config, adapter),
+        price_category_index=None,
+        config=config,
+    )
+
+    recorder = StageRecorder(trace_allocations=not args.no_allocations)
+
+    for stage in stages:
+        setattr(parse_service, stage, recorder.wrap(stage, getattr(parse_service, stage)))
+
+    upcs = load_upcs(args)
+
+    if not upcs:
+        print(f"No UPCs to process, record some responses into {args.responses} first")
+        return
+
+    items = list(islice(cycle(upcs), len(upcs) if args.record else args.items))
+
+    if recorder.trace_allocations:
+        tracemalloc.start()
+
+    started_at = perf_counter()
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for result in executor.map(lambda upc: _fetch_safe(parse_service, upc), items):
+            failed += result is None
+
+    elapsed = perf_counter() - started_at
+
+    if recorder.trace_allocations:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+
+    print(f"Processed {len(items)} items ({failed} failed) in {elapsed:.2f} s, {len(items) / elapsed:.1f} items/s")
+    recorder.report()
+
+
+def _fetch_safe(parse_service: ParseService, upc: str) -> dict[str, ...] | None:
+    try:
+        return parse_service._fetch_barcode_data(upc)  # noqa
+    except Exception as exception:
+        print(f"{upc}: {exception!r}")
+        return None
+
+
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,92 @@
+import os
+from argparse import ArgumentParser
+from argparse import Namespace
+from statistics import mean
+from time import perf_counter
+from typing import Callable
+
+from sqlalchemy import event
+
+from auctions.config import Config
+from auctions.db.models.price_categories import PriceCategory
+from auctions.db.repositories.price_categories import PriceCategoriesRepository
+from auctions.db.session import SessionManager
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description="Benchmark Repository.update strategies inside a rolled back transaction")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    return parser.parse_args()
+
+
+def update_with_merge(repository: PriceCategoriesRepository, instances: list[PriceCategory], value: int) -> None:
+    for instance in instances:
+        repository.session.merge(instance)
+        instance.bid_min_step = value
+        repository.session.flush()
+
+
+def update_attached(repository: PriceCategoriesRepository, instances: list[PriceCategory], value: int) -> None:
+    for instance in instances:
+        repository.update(instance, bid_min_step=value)
+
+
+def update_bulk(repository: PriceCategoriesRepository, instances: list[PriceCategory], value: int) -> None:
+    repository.update_many([instance.id for instance in instances], bid_min_step=value)
+
+
+strategies: dict[str, Callable[[PriceCategoriesRepository, list[PriceCategory], int], None]] = {
+    "merge + flush per row": update_with_merge,
+    "attribute set + flush per row": update_attached,
+    "single UPDATE ... WHERE id IN": update_bulk,
+}
+
+
+def execute() -> None:
+    args = parse_args()
+    config = Config.load(os.getenv("CONFIG_PATH", "config/config.yml"))
+    session_manager = SessionManager(config, role="benchmark")
+    repository = PriceCategoriesRepository(session=session_manager.session, config=config)
+
+    statement_counter = StatementCounter()
+    event.listen(session_manager.engine, "before_cursor_execute", statement_counter)
+
+    try:
+        instances = repository.create_many([
+            {"alias": f"benchmark-{index}", "usd": 0.0, "rub": index}
+            for index in range(args.rows)
+        ])
+
+        print(f"{'strategy':<32} {'mean ms':>9} {'ms/row':>8} {'statements':>11}")
+
+        for name, strategy in strategies.items():
+            timings = []
+            statement_counter.count = 0
+
+            for round_ in range(args.rounds):
+                started_at = perf_counter()
+                strategy(repository, instances, round_ + 1)
+                session_manager.session.flush()
+                timings.append(perf_counter() - started_at)
+
+            statements = statement_counter.count / args.rounds
+            print(
+                f"{name:<32} {mean(timings) * 1000:>9.2f} "
+                f"{mean(timings) * 1000 / args.rows:>8.3f} {statements:>11.1f}"
+            )
+    finally:
+        session_manager.session.rollback()
+        session_manager.session.remove()
+
+
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,109 @@
+import os
+import sys
+from typing import Iterator
+
+from sqlalchemy import Select
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from auctions.config import Config
+from auctions.db.models.auction_sets import AuctionSet
+from auctions.db.models.auctions import Auction
+from auctions.db.models.bids import Bid
+from auctions.db.models.items import Item
+from auctions.db.models.push import PushSubscription
+from auctions.db.session import SessionManager
+
+
+# Each hot predicate with the indexes the planner may pick for it. Sequential scans are disabled for the check,
+# so an empty table still shows whether an index can serve the query at all.
+hot_queries: dict[str, tuple[Select, tuple[str, ...]]] = {
+    "last bid of an auction": (
+        select(Bid.id).where(Bid.auction_id == 1, Bid.next_bid_id.is_(None)),
+        ("ix_bids_auction_id_last",),
+    ),
+    "bids of an auction by time": (
+        select(Bid.id).where(Bid.auction_id == 1).order_by(Bid.created_at),
+        ("ix_bids_auction_id_created_at",),
+    ),
+    "bids of a user": (
+        select(Bid.id).where(Bid.user_id == "user"),
+        ("ix_bids_user_id",),
+    ),
+    "bid that was outbid": (
+        select(Bid.id).where(Bid.next_bid_id == 1),
+        ("ix_bids_next_bid_id",),
+    ),
+    "running auctions of a set": (
+        select(Auction.id).where(Auction.set_id == 1, Auction.ended_at.is_(None)),
+        ("ix_auctions_set_id_ended_at",),
+    ),
+    "auctions of an item": (
+        select(Auction.id).where(Auction.item_id == 1),
+        ("ix_auctions_item_id",),
+    ),
+    "active sets by due date": (
+        select(AuctionSet.id).where(AuctionSet.ended_at.is_(None), AuctionSet.date_due <= func.now()),
+        ("ix_auction_sets_date_due_active", "ix_auction_sets_ended_at"),
+    ),
+    "published sets by due date": (
+        select(AuctionSet.id).where(AuctionSet.date_due <= func.now(), AuctionSet.is_published.is_(True)),
+        ("ix_auction_sets_date_due_is_published",),
+    ),
+    "items of a type and price category": (
+        select(Item.id).where(Item.type_id == 1, Item.price_category_id == 1),
+        ("ix_items_type_id_price_category_id",),
+    ),
+    "items of a supply session": (
+        select(Item.id).where(Item.session_id == 1),
+        ("ix_items_session_id",),
+    ),
+    "push subscriptions of a user": (
+        select(PushSubscription.id).where(PushSubscription.user_id == "user"),
+        ("ix_push_subscriptions_user_id",),
+    ),
+}
+
+
+def iter_index_names(plan: dict[str, ...]) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+
+    for subplan in plan.get("Plans", []):
+        yield from iter_index_names(subplan)
+
+
+def explain(connection: Connection, query: Select) -> set[str]:
+    statement = query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    [[result]] = connection.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).all()
+    return set(iter_index_names(result[0]["Plan"]))
+
+
+def execute() -> None:
+    config = Config.load(os.getenv("CONFIG_PATH", "config/config.yml"))
+    session_manager = SessionManager(config, role="benchmark")
+    failed = False
+
+    print(f"{'query':<36} {'status':<6} indexes")
+
+    # SET LOCAL only lasts until the end of the transaction, so the plans are explained inside an explicit one
+    # that is rolled back afterwards.
+    with session_manager.engine.connect() as connection, connection.begin() as transaction:
+        try:
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+
+            for name, (query, expected_indexes) in hot_queries.items():
+                used_indexes = explain(connection, query)
+                is_ok = bool(used_indexes & set(expected_indexes))
+                failed |= not is_ok
+                print(f"{name:<36} {'ok' if is_ok else 'FAIL':<6} {', '.join(sorted(used_indexes)) or '-'}")
+        finally:
+            transaction.rollback()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    execute()
@@ -21,13 +21,16 @@ from auctions.db.models.auctions import Auction
 from auctions.db.models.auction_sets import AuctionSet
 from auctions.db.models.base import Model
 from auctions.db.models.bids import Bid
+from auctions.db.models.exports import ExportJob
 from auctions.db.models.images import Image
+from auctions.db.models.invoices import Invoice
 from auctions.db.models.item_types import ItemType
 from auctions.db.models.items import Item
 from auctions.db.models.price_categories import PriceCategory
 from auctions.db.models.push import PushSubscription
 from auctions.db.models.sessions import SupplySession
 from auctions.db.models.templates import Template
+from auctions.db.models.upc_lookups import UpcLookup
 from auctions.db.models.users import User
 
 target_metadata = Model.metadata
@@ -1,14 +1,11 @@
-from multiprocessing import cpu_count
-
 import uvicorn
 
 
-def run_configured(app):
+def run_configured(app, port: int = 1337):
     config = uvicorn.Config(
         app,
         host="0.0.0.0",
-        port=1337,
-        workers=cpu_count() + 1,
+        port=port,
         interface="wsgi",
         log_level="debug",
     )